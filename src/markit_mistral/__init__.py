@@ -10,11 +10,38 @@ __author__ = "Seyed Yahya Shirazi"
 __email__ = "shirazi@ieee.org"
 __description__ = "PDF and image to markdown converter using Mistral AI OCR"
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .config import Config
-from .converter import MarkItMistral
-from .file_processor import FileProcessorManager, create_file_processor
-from .markdown_formatter import MarkdownFormatter
-from .ocr_processor import OCRProcessor
+
+if TYPE_CHECKING:
+    from .converter import MarkItMistral
+    from .file_processor import FileProcessorManager, create_file_processor
+    from .markdown_formatter import MarkdownFormatter
+    from .ocr_processor import OCRProcessor
+
+# Public names whose modules pull in mistralai or Pillow. They are imported
+# on first access so that `markit-mistral --help` and config-only callers do
+# not pay for the SDK import.
+_LAZY_IMPORTS = {
+    "MarkItMistral": ".converter",
+    "OCRProcessor": ".ocr_processor",
+    "FileProcessorManager": ".file_processor",
+    "create_file_processor": ".file_processor",
+    "MarkdownFormatter": ".markdown_formatter",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazily exported name on first access."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "MarkItMistral",
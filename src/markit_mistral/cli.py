@@ -10,7 +10,6 @@ from pathlib import Path
 
 from . import __description__, __version__
 from .config import Config
-from .converter import MarkItMistral
 from .exceptions import MarkItMistralError, get_user_friendly_message
 
 
@@ -121,10 +120,15 @@ Examples:
     return parser
 
 
-def main() -> int:
-    """Main CLI entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """Main CLI entry point.
+
+    Args:
+        argv: Command-line arguments, excluding the program name. Defaults
+            to ``sys.argv[1:]``.
+    """
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     try:
         # Create configuration
@@ -156,7 +160,10 @@ def main() -> int:
         # Validate configuration
         config.validate()
 
-        # Create converter
+        # Create converter; imported here so that argument parsing and
+        # --help do not load the Mistral SDK
+        from .converter import MarkItMistral
+
         converter = MarkItMistral(config=config)
 
         # Configure output manager
@@ -193,8 +200,7 @@ def main() -> int:
             else:
                 # Output to stdout
                 result_path = converter.convert_file(input_path)
-                with open(result_path, encoding="utf-8") as f:
-                    print(f.read(), end="")
+                print(result_path.read_text(encoding="utf-8"), end="")
 
                 # Clean up temporary file if we created one
                 if result_path.parent == config.get_temp_dir():
@@ -247,8 +253,7 @@ def main() -> int:
                 else:
                     # Output to stdout
                     result_path = converter.convert_file(temp_input_path)
-                    with open(result_path, encoding="utf-8") as f:
-                        print(f.read(), end="")
+                    print(result_path.read_text(encoding="utf-8"), end="")
 
                     # Clean up temporary result file
                     if result_path.parent == config.get_temp_dir():
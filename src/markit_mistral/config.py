@@ -17,6 +17,7 @@ class Config:
     max_retries: int = 3
     retry_delay: float = 1.0
     max_file_size_mb: int = 50
+    rpm_limit: int | None = None
 
     # Output Configuration
     include_images: bool = True
@@ -38,6 +39,7 @@ class Config:
             max_retries=int(os.getenv("MARKIT_MISTRAL_MAX_RETRIES", "3")),
             retry_delay=float(os.getenv("MARKIT_MISTRAL_RETRY_DELAY", "1.0")),
             max_file_size_mb=int(os.getenv("MARKIT_MISTRAL_MAX_FILE_SIZE_MB", "50")),
+            rpm_limit=int(os.getenv("MARKIT_MISTRAL_RPM_LIMIT", "0")) or None,
             include_images=os.getenv("MARKIT_MISTRAL_INCLUDE_IMAGES", "true").lower()
             == "true",
             preserve_math=os.getenv("MARKIT_MISTRAL_PRESERVE_MATH", "true").lower()
@@ -81,6 +83,9 @@ class Config:
         if self.max_file_size_mb < 1:
             raise ValueError("max_file_size_mb must be at least 1")
 
+        if self.rpm_limit is not None and self.rpm_limit < 1:
+            raise ValueError("rpm_limit must be at least 1")
+
         if self.log_level not in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
             raise ValueError(f"Invalid log level: {self.log_level}")
 
@@ -9,7 +9,9 @@ from __future__ import annotations
 
 import hashlib
 import logging
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
 from .config import Config
 from .file_processor import create_file_processor
@@ -23,12 +25,42 @@ from .output_manager import OutputManager
 
 logger = logging.getLogger(__name__)
 
+# Input stems too generic to use as image prefixes
+_GENERIC_STEMS: frozenset[str] = frozenset(
+    {"input", "document", "file", "temp", "tmp", "output", "scan"}
+)
+
+# Read size for content hashing on Pythons without hashlib.file_digest
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# hashlib.file_digest (3.11+) reads into a reused buffer with the GIL released
+_file_digest = getattr(hashlib, "file_digest", None)
+
 
 def _content_hash(path: Path, length: int = 6) -> str:
     """Return a short hex digest of a file's contents for uniqueness."""
-    h = hashlib.sha256()
+    st = path.stat()
+    return _cached_content_hash(str(path), st.st_size, st.st_mtime_ns, length)
+
+
+@lru_cache(maxsize=256)
+def _cached_content_hash(path: str, size: int, mtime_ns: int, length: int) -> str:  # noqa: ARG001
+    """Hash a file's contents, reusing earlier digests.
+
+    Size and modification time are part of the cache key so that a file
+    rewritten in place is hashed again.
+    """
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        return _content_hash_stream(f, length)
+
+
+def _content_hash_stream(f: BinaryIO, length: int = 6) -> str:
+    """Return a short hex digest of a binary stream's remaining contents."""
+    if _file_digest is not None:
+        h = _file_digest(f, hashlib.blake2b)
+    else:
+        h = hashlib.blake2b()
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
             h.update(chunk)
     return h.hexdigest()[:length]
 
@@ -59,8 +91,7 @@ def generate_image_prefix(
     if slug is None or slug == "document":
         stem = input_path.stem
         # Reject very generic stems
-        generic_stems = {"input", "document", "file", "temp", "tmp", "output", "scan"}
-        if stem.lower() not in generic_stems:
+        if stem.lower() not in _GENERIC_STEMS:
             slug = title_to_slug(stem)
 
     # Layer 3: output filename
@@ -127,6 +158,7 @@ class MarkItMistral:
             api_key=self.config.mistral_api_key,
             max_retries=self.config.max_retries,
             retry_delay=self.config.retry_delay,
+            rpm_limit=self.config.rpm_limit,
         )
         self.markdown_formatter = MarkdownFormatter(
             preserve_math=self.config.preserve_math,
@@ -76,11 +76,13 @@ class APIRateLimitError(APIError):
     """Raised when API rate limit is hit."""
 
     def __init__(
-        self, message: str = "API rate limit exceeded", retry_after: int | None = None
+        self,
+        message: str = "API rate limit exceeded",
+        retry_after: float | None = None,
     ):
         details = "Please wait before making more requests"
         if retry_after:
-            details += f" (retry after {retry_after} seconds)"
+            details += f" (retry after {retry_after:g} seconds)"
         super().__init__(message, details=details)
         self.retry_after = retry_after
 
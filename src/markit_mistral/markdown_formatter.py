@@ -1,42 +1,153 @@
 """Markdown formatting and processing for markit-mistral."""
 
+import collections
 import logging
+import mimetypes
+import os
 import re
+import string
+import threading
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+# pybase64 provides SIMD base64 kernels; fall back to the stdlib otherwise
+try:
+    import pybase64 as base64
+except ImportError:  # pragma: no cover - optional accelerator
+    import base64
+
 logger = logging.getLogger(__name__)
 
 _MAX_SLUG_LENGTH = 50
 
-# Headings that are too generic to use as image prefixes
-_TRIVIAL_HEADINGS = {
-    "introduction",
-    "abstract",
-    "table of contents",
-    "contents",
-    "references",
-    "bibliography",
-    "acknowledgements",
-    "acknowledgments",
-    "appendix",
-    "index",
-    "preface",
-    "foreword",
-    "summary",
-    "overview",
-    "disclaimer",
-    "copyright",
-    "list of figures",
-    "list of tables",
-}
+# Horizontal whitespace stripped from line ends
+_HSPACE = " \t"
+
+# Default budget for cached image data URIs, in bytes of encoded text
+_DATA_URI_CACHE_BYTES = 64 * 1024 * 1024
+
+# Worker threads used to read and encode images for base64 embedding
+_MAX_ENCODE_WORKERS = 8
+# Batches up to this size are encoded inline, without starting a thread pool
+_MAX_INLINE_ENCODES = 2
 
+# Maps ASCII whitespace and underscores to hyphens and deletes every other
+# ASCII character that may not appear in a slug
+_SLUG_TABLE = str.maketrans(
+    {
+        c: "-" if c.isspace() or c == "_" else None
+        for c in map(chr, range(128))
+        if c not in string.ascii_lowercase + string.digits + "-"
+    }
+)
 
+# Headings that are too generic to use as image prefixes
+_TRIVIAL_HEADINGS: frozenset[str] = frozenset(
+    {
+        "introduction",
+        "abstract",
+        "table of contents",
+        "contents",
+        "references",
+        "bibliography",
+        "acknowledgements",
+        "acknowledgments",
+        "appendix",
+        "index",
+        "preface",
+        "foreword",
+        "summary",
+        "overview",
+        "disclaimer",
+        "copyright",
+        "list of figures",
+        "list of tables",
+    }
+)
+
+# Title extraction and slug patterns, compiled once for generate_image_prefix
+_H1_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+_H2_RE = re.compile(r"^##\s+(.+)$", re.MULTILINE)
+# Leading numbering such as "1. " or "IV) " on a heading
+_HEADING_NUMBER_RE = re.compile(r"^[\divxlcm]+[\.\)\s]+", re.IGNORECASE)
+
+# Markdown image syntax: ![alt](filename)
+_IMAGE_REF_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+
+# Math delimiter normalization, applied in order by _normalize_math_delimiters
+_MATH_DELIMITER_SUBS: tuple[tuple[re.Pattern[str], str], ...] = (
+    # Convert \(...\) to $...$
+    (re.compile(r"\\?\\\(([^)]+)\\?\\\)"), r"$\1$"),
+    # Convert \[...\] to $$...$$
+    (re.compile(r"\\?\\\[([^\]]+)\\?\\\]"), r"$$\1$$"),
+    # Fix malformed delimiters
+    (re.compile(r"\$\s*\$([^$]+)\$\s*\$"), r"$$\1$$"),
+    # Ensure display math has proper spacing
+    (re.compile(r"([^\n])\$\$"), r"\1\n$$"),
+    (re.compile(r"\$\$([^\n])"), r"$$\n\1"),
+)
+
+# Common OCR corrections for math, applied in order by _fix_common_math_errors
+_MATH_CORRECTIONS: tuple[tuple[re.Pattern[str], str], ...] = (
+    # Fix superscripts
+    (re.compile(r"([a-zA-Z])\s*\^\s*([0-9]+)"), r"\1^{\2}"),
+    # Fix subscripts
+    (re.compile(r"([a-zA-Z])\s*_\s*([0-9]+)"), r"\1_{\2}"),
+    # Fix fractions
+    (
+        re.compile(r"\\frac\s*\{\s*([^}]+)\s*\}\s*\{\s*([^}]+)\s*\}"),
+        r"\\frac{\1}{\2}",
+    ),
+    # Fix square roots
+    (re.compile(r"\\sqrt\s*\{\s*([^}]+)\s*\}"), r"\\sqrt{\1}"),
+    # Fix summations
+    (
+        re.compile(r"\\sum\s*_\s*\{\s*([^}]+)\s*\}\s*\^\s*\{\s*([^}]+)\s*\}"),
+        r"\\sum_{{\1}}^{{\2}}",
+    ),
+)
+
+# Block spacing fixes, applied in order by _apply_final_formatting
+_FINAL_FORMATTING_SUBS: tuple[tuple[re.Pattern[str], str], ...] = (
+    # Ensure proper spacing around headers
+    (re.compile(r"(^|\n)(#{1,6}\s+[^\n]+)\n(?!\n)"), r"\1\2\n\n"),
+    # Ensure proper spacing around code blocks
+    (re.compile(r"(^|\n)(```[^`]*```)\n(?!\n)"), r"\1\2\n\n"),
+    # Ensure proper spacing around block quotes
+    (re.compile(r"(^|\n)(>[^\n]+)\n(?!\n)"), r"\1\2\n\n"),
+    # Final cleanup
+    (re.compile(r"\n{3,}"), "\n\n"),
+)
+
+# Single-pass whitespace, heading and list normalization for
+# _clean_markdown_content. Each branch reproduces one of the substitutions
+# that used to run as a separate re.sub over the whole page.
+_CLEAN_RE = re.compile(
+    r"(?P<blank>\n\s*\n\s*\n+)"
+    r"|(?P<trail>[ \t]+$)"
+    r"|^(?P<heading>(?P<hashes>#{1,6})\s*(?P<heading_text>.+))"
+    r"|^(?P<bullet>(?P<bullet_marker>[ \t]*[-*+])\s+)"
+    r"|^(?P<ordered>(?P<ordered_marker>[ \t]*\d+\.)\s+)",
+    re.MULTILINE,
+)
+
+# extract_metadata patterns. Each construct gets its own scan: a combined
+# alternation cannot overlap matches, so e.g. "$5 ... ![img](a.png) ... $2"
+# would hide the image inside an inline-math match.
+_HEADER_RE = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
+_INLINE_MATH_RE = re.compile(r"\$[^$]+\$")
+_DISPLAY_MATH_RE = re.compile(r"\$\$[^$]+\$\$")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+
+
+@lru_cache(maxsize=1024)
 def _is_trivial_heading(heading: str) -> bool:
     """Check if a heading is too generic to serve as an image prefix."""
     normalized = heading.strip().lower()
     # Strip leading numbering like "1. Introduction" or "I. Abstract"
-    normalized = re.sub(r"^[\divxlcm]+[\.\)\s]+", "", normalized, flags=re.IGNORECASE)
+    normalized = _HEADING_NUMBER_RE.sub("", normalized)
     normalized = normalized.strip()
     return normalized in _TRIVIAL_HEADINGS
 
@@ -48,39 +159,49 @@ def extract_title_from_markdown(pages: list) -> str | None:
     Skips generic headings like 'Introduction', 'Abstract', etc.
     Returns None if no suitable heading is found.
     """
+    # Only pages containing "#" can hold a heading; a substring check is far
+    # cheaper than running the heading patterns over every page
+    heading_pages = [
+        markdown
+        for page in pages
+        if (markdown := getattr(page, "markdown", None)) and "#" in markdown
+    ]
+
     # Pass 1: look for a non-trivial H1
-    for page in pages:
-        if hasattr(page, "markdown") and page.markdown:
-            for match in re.finditer(r"^#\s+(.+)$", page.markdown, re.MULTILINE):
-                title = match.group(1).strip()
-                if not _is_trivial_heading(title):
-                    return title
+    for markdown in heading_pages:
+        for match in _H1_RE.finditer(markdown):
+            title = match.group(1).strip()
+            if not _is_trivial_heading(title):
+                return title
 
     # Pass 2: look for a non-trivial H2
-    for page in pages:
-        if hasattr(page, "markdown") and page.markdown:
-            for match in re.finditer(r"^##\s+(.+)$", page.markdown, re.MULTILINE):
-                title = match.group(1).strip()
-                if not _is_trivial_heading(title):
-                    return title
+    for markdown in heading_pages:
+        for match in _H2_RE.finditer(markdown):
+            title = match.group(1).strip()
+            if not _is_trivial_heading(title):
+                return title
 
     return None
 
 
+@lru_cache(maxsize=1024)
 def title_to_slug(title: str) -> str:
     """Convert a title string to a filesystem-safe slug.
 
     Lowercase, hyphens for spaces, strip special chars, truncate to 50 chars.
     """
-    # Normalize unicode
-    slug = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    # Normalize unicode; ASCII titles (the common case) are already normalized
+    if title.isascii():
+        slug = title
+    else:
+        slug = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
     slug = slug.lower()
-    # Replace whitespace and underscores with hyphens
-    slug = re.sub(r"[\s_]+", "-", slug)
-    # Strip non-alphanumeric (keep hyphens)
-    slug = re.sub(r"[^a-z0-9-]", "", slug)
+    # Replace whitespace and underscores with hyphens, strip other
+    # non-alphanumeric characters
+    slug = slug.translate(_SLUG_TABLE)
     # Collapse multiple hyphens
-    slug = re.sub(r"-{2,}", "-", slug)
+    while "--" in slug:
+        slug = slug.replace("--", "-")
     # Strip leading/trailing hyphens
     slug = slug.strip("-")
     # Truncate
@@ -89,19 +210,91 @@ def title_to_slug(title: str) -> str:
     return slug or "document"
 
 
+def _image_to_data_uri(img_path: Path) -> str:
+    """Read an image file and return it as a base64 data URI."""
+    mime_type, _ = mimetypes.guess_type(str(img_path))
+    if not mime_type:
+        mime_type = "image/jpeg"  # default
+
+    base64_str = base64.b64encode(img_path.read_bytes()).decode("ascii")
+    return f"data:{mime_type};base64,{base64_str}"
+
+
+def _space_math_operators(math: str) -> str:
+    """Add spaces around +, - and = between alphanumerics in a math span.
+
+    Operators inside braces (subscripts, superscripts, arguments) are left
+    untouched, so ``x_{n-1}`` keeps its compact form.
+    """
+    if "+" not in math and "-" not in math and "=" not in math:
+        return math
+
+    result: list[str] = []
+    brace_depth = 0
+    last = len(math) - 1
+    for i, ch in enumerate(math):
+        if ch == "{":
+            brace_depth += 1
+        elif ch == "}":
+            brace_depth = max(0, brace_depth - 1)
+        elif (
+            brace_depth == 0
+            and ch in "+-="
+            and 0 < i < last
+            and math[i - 1].isalnum()
+            and math[i + 1].isalnum()
+        ):
+            if result and result[-1] != " ":
+                result.append(" ")
+            result.append(ch)
+            result.append(" ")
+            continue
+        result.append(ch)
+    return "".join(result)
+
+
+def _clean_replacement(match: re.Match[str]) -> str:
+    """Return the normalized text for one _CLEAN_RE match."""
+    kind = match.lastgroup
+    if kind == "blank":
+        return "\n\n"
+    if kind == "trail":
+        return ""
+    if kind == "heading":
+        # The heading consumes its line, so strip trailing whitespace here
+        return f"{match['hashes']} {match['heading_text'].rstrip(_HSPACE)}"
+    if kind == "bullet":
+        return f"{match['bullet_marker']} "
+    return f"{match['ordered_marker']} "
+
+
 class MarkdownFormatter:
     """Handles markdown formatting, math equation processing, and image management."""
 
-    def __init__(self, preserve_math: bool = True, base64_images: bool = False):
+    def __init__(
+        self,
+        preserve_math: bool = True,
+        base64_images: bool = False,
+        data_uri_cache_bytes: int = _DATA_URI_CACHE_BYTES,
+    ):
         """Initialize the markdown formatter.
 
         Args:
             preserve_math: Whether to preserve and enhance mathematical equations.
             base64_images: Whether to embed images as base64 instead of file links.
+            data_uri_cache_bytes: Memory budget for reusing the data URIs of
+                images that are embedded again unchanged. 0 disables caching.
         """
         self.preserve_math = preserve_math
         self.base64_images = base64_images
 
+        self.data_uri_cache_bytes = data_uri_cache_bytes
+        self._data_uri_cache: collections.OrderedDict[tuple[str, int, int], str] = (
+            collections.OrderedDict()
+        )
+        self._data_uri_cache_size = 0
+        self._data_uri_cache_lock = threading.Lock()
+
     def format_document(
         self,
         pages: list[dict],
@@ -131,18 +324,23 @@ class MarkdownFormatter:
 
         # Create image mapping for reference replacement
         image_map = self._create_image_map(image_paths, output_dir, rename_map)
+        # Image lookups resolved so far, shared by all pages
+        resolved_refs: dict[str, str | None] = {}
 
         # Process each page
         for page_idx, page in enumerate(pages):
-            if hasattr(page, "markdown") and page.markdown:
-                page_content = str(page.markdown)
+            if markdown := getattr(page, "markdown", None):
+                page_content = str(markdown)
 
                 # Process math equations if enabled
                 if self.preserve_math:
                     page_content = self._process_math_equations(page_content)
 
-                # Update image references
-                page_content = self._update_image_references(page_content, image_map)
+                # Update image references (only pages with image syntax can change)
+                if image_map and "![" in page_content:
+                    page_content = self._update_image_references(
+                        page_content, image_map, resolved_refs
+                    )
 
                 # Add page separator for multi-page documents
                 if page_idx > 0 and len(pages) > 1:
@@ -178,81 +376,167 @@ class MarkdownFormatter:
         """
         image_map = {}
         # Build reverse lookup: new_filename -> original_id
-        reverse_rename = {v: k for k, v in (rename_map or {}).items()}
-
-        for img_path in image_paths:
-            if self.base64_images:
-                # Convert to base64 data URI
-                try:
-                    import base64
-
-                    with open(img_path, "rb") as f:
-                        img_data = f.read()
-
-                    # Determine MIME type
-                    import mimetypes
-
-                    mime_type, _ = mimetypes.guess_type(str(img_path))
-                    if not mime_type:
-                        mime_type = "image/jpeg"  # default
-
-                    base64_str = base64.b64encode(img_data).decode("utf-8")
-                    data_uri = f"data:{mime_type};base64,{base64_str}"
-                    image_map[img_path.name] = data_uri
-                    # Also map original ID so markdown refs get updated
-                    if img_path.name in reverse_rename:
-                        image_map[reverse_rename[img_path.name]] = data_uri
-
-                except Exception as e:
-                    logger.warning(f"Failed to encode image {img_path} as base64: {e}")
-                    # Fallback to file path
-                    rel_path = img_path.relative_to(output_dir)
-                    image_map[img_path.name] = str(rel_path)
-                    if img_path.name in reverse_rename:
-                        image_map[reverse_rename[img_path.name]] = str(rel_path)
+        reverse_rename = {v: k for k, v in rename_map.items()} if rename_map else None
+
+        data_uris: list[str | None]
+        if self.base64_images:
+            data_uris = self._encode_images(image_paths)
+        else:
+            data_uris = [None] * len(image_paths)
+
+        # Relative directory per parent; images normally share one directory,
+        # so relative_to() runs once rather than once per image
+        relative_dirs: dict[Path, str] = {}
+
+        for img_path, data_uri in zip(image_paths, data_uris, strict=True):
+            # Use the data URI if available, otherwise the relative file path
+            if data_uri:
+                ref = data_uri
             else:
-                # Use relative file path
-                rel_path = img_path.relative_to(output_dir)
-                image_map[img_path.name] = str(rel_path)
-                # Also map original ID so markdown refs get updated
-                if img_path.name in reverse_rename:
-                    image_map[reverse_rename[img_path.name]] = str(rel_path)
+                parent = img_path.parent
+                if parent not in relative_dirs:
+                    relative_dirs[parent] = str(parent.relative_to(output_dir))
+                relative_dir = relative_dirs[parent]
+                ref = (
+                    img_path.name
+                    if relative_dir == "."
+                    else os.path.join(relative_dir, img_path.name)
+                )
+            image_map[img_path.name] = ref
+            # Also map original ID so markdown refs get updated
+            if reverse_rename is not None and img_path.name in reverse_rename:
+                image_map[reverse_rename[img_path.name]] = ref
 
         return image_map
 
-    def _update_image_references(self, content: str, image_map: dict[str, str]) -> str:
+    def _encode_images(self, image_paths: list[Path]) -> list[str | None]:
+        """Encode image files as base64 data URIs.
+
+        Files are read and encoded on a thread pool, since the work is mostly
+        blocking I/O. Small batches are encoded inline to avoid the pool
+        startup cost.
+
+        Args:
+            image_paths: List of image file paths.
+
+        Returns:
+            Data URIs in the same order as image_paths, with None for images
+            that could not be encoded.
+        """
+
+        def encode(img_path: Path) -> str | None:
+            try:
+                return self._cached_data_uri(img_path)
+            except Exception as e:
+                logger.warning(f"Failed to encode image {img_path} as base64: {e}")
+                return None
+
+        if len(image_paths) <= _MAX_INLINE_ENCODES:
+            return [encode(img_path) for img_path in image_paths]
+
+        with ThreadPoolExecutor(max_workers=_MAX_ENCODE_WORKERS) as pool:
+            return list(pool.map(encode, image_paths))
+
+    def _cached_data_uri(self, img_path: Path) -> str:
+        """Encode an image to a data URI, reusing the result for unchanged files.
+
+        Entries are keyed by path, modification time and size, so an image
+        rewritten in place is encoded again. The least recently used entries
+        are evicted once the cache exceeds data_uri_cache_bytes.
+
+        Args:
+            img_path: Path to the image file.
+
+        Returns:
+            Data URI string for the image.
+        """
+        stat = img_path.stat()
+        key = (str(img_path), stat.st_mtime_ns, stat.st_size)
+
+        with self._data_uri_cache_lock:
+            cached = self._data_uri_cache.get(key)
+            if cached is not None:
+                self._data_uri_cache.move_to_end(key)
+                return cached
+
+        data_uri = _image_to_data_uri(img_path)
+
+        size = len(data_uri)
+        if size <= self.data_uri_cache_bytes:
+            with self._data_uri_cache_lock:
+                if key not in self._data_uri_cache:
+                    self._data_uri_cache[key] = data_uri
+                    self._data_uri_cache_size += size
+                while self._data_uri_cache_size > self.data_uri_cache_bytes:
+                    _, evicted = self._data_uri_cache.popitem(last=False)
+                    self._data_uri_cache_size -= len(evicted)
+
+        return data_uri
+
+    def _update_image_references(
+        self,
+        content: str,
+        image_map: dict[str, str],
+        resolved: dict[str, str | None] | None = None,
+    ) -> str:
         """Update image references in markdown content.
 
         Args:
             content: Markdown content with image references.
             image_map: Mapping of image filenames to their references.
+            resolved: Optional cache of filename lookups, shared across the
+                pages of a document so each reference is matched only once.
 
         Returns:
             Updated markdown content with correct image references.
         """
-        # Pattern to match markdown image syntax: ![alt](filename)
-        pattern = r"!\[([^\]]*)\]\(([^)]+)\)"
+        if resolved is None:
+            resolved = {}
 
         def replace_image_ref(match: re.Match[str]) -> str:
             alt_text = match.group(1)
             filename = match.group(2)
 
-            # Try to find the image in our map
-            for img_name, img_ref in image_map.items():
-                if filename in img_name or img_name in filename:
-                    return f"![{alt_text}]({img_ref})"
-
-            # If no exact match, try partial matches
-            for img_name, img_ref in image_map.items():
-                if any(
-                    part in img_name.lower() for part in filename.lower().split("_")
-                ):
-                    return f"![{alt_text}]({img_ref})"
+            if filename not in resolved:
+                resolved[filename] = self._resolve_image_ref(filename, image_map)
+            img_ref = resolved[filename]
 
             # Keep original reference if no match found
-            return match.group(0)
+            if img_ref is None:
+                return match.group(0)
+            return f"![{alt_text}]({img_ref})"
+
+        return _IMAGE_REF_RE.sub(replace_image_ref, content)
+
+    def _resolve_image_ref(
+        self, filename: str, image_map: dict[str, str]
+    ) -> str | None:
+        """Find the reference for an image filename used in markdown.
+
+        Args:
+            filename: Image target as written in the markdown.
+            image_map: Mapping of image filenames to their references.
 
-        return re.sub(pattern, replace_image_ref, content)
+        Returns:
+            The matching reference, or None if no image matches.
+        """
+        # Exact filename or basename match
+        img_ref = image_map.get(filename) or image_map.get(filename.rsplit("/", 1)[-1])
+        if img_ref is not None:
+            return img_ref
+
+        # Try to find the image in our map
+        for img_name, img_ref in image_map.items():
+            if filename in img_name or img_name in filename:
+                return img_ref
+
+        # If no exact match, try partial matches
+        parts = filename.lower().split("_")
+        for img_name, img_ref in image_map.items():
+            if any(part in img_name.lower() for part in parts):
+                return img_ref
+
+        return None
 
     def _process_math_equations(self, content: str) -> str:
         """Process and enhance mathematical equations in the content.
@@ -263,10 +547,14 @@ class MarkdownFormatter:
         Returns:
             Content with processed math equations.
         """
-        # Apply various math processing steps
-        content = self._normalize_math_delimiters(content)
-        content = self._enhance_math_formatting(content)
-        content = self._fix_common_math_errors(content)
+        # Apply various math processing steps, skipping any step whose
+        # patterns cannot match this content
+        if "$" in content or "\\(" in content or "\\[" in content:
+            content = self._normalize_math_delimiters(content)
+        if "$" in content:
+            content = self._enhance_math_formatting(content)
+        if "^" in content or "_" in content or "\\" in content:
+            content = self._fix_common_math_errors(content)
 
         return content
 
@@ -279,18 +567,8 @@ class MarkdownFormatter:
         Returns:
             Content with normalized math delimiters.
         """
-        # Convert \(...\) to $...$
-        content = re.sub(r"\\?\\\(([^)]+)\\?\\\)", r"$\1$", content)
-
-        # Convert \[...\] to $$...$$
-        content = re.sub(r"\\?\\\[([^\]]+)\\?\\\]", r"$$\1$$", content)
-
-        # Fix malformed delimiters
-        content = re.sub(r"\$\s*\$([^$]+)\$\s*\$", r"$$\1$$", content)
-
-        # Ensure display math has proper spacing
-        content = re.sub(r"([^\n])\$\$", r"\1\n$$", content)
-        content = re.sub(r"\$\$([^\n])", r"$$\n\1", content)
+        for pattern, replacement in _MATH_DELIMITER_SUBS:
+            content = pattern.sub(replacement, content)
 
         return content
 
@@ -304,44 +582,25 @@ class MarkdownFormatter:
             Content with enhanced math formatting.
         """
 
-        # Add proper spacing around operators in inline math,
-        # but only at the top level (not inside braces like subscripts/superscripts).
-        def enhance_inline_math(match: re.Match[str]) -> str:
-            math_content = match.group(1)
-            # Only add spaces around operators that are NOT inside braces
-            result: list[str] = []
-            brace_depth = 0
-            i = 0
-            while i < len(math_content):
-                ch = math_content[i]
-                if ch == "{":
-                    brace_depth += 1
-                elif ch == "}":
-                    brace_depth = max(0, brace_depth - 1)
-
-                if (
-                    brace_depth == 0
-                    and ch in "+-="
-                    and i > 0
-                    and i < len(math_content) - 1
-                ):
-                    prev = math_content[i - 1]
-                    nxt = math_content[i + 1]
-                    if prev.isalnum() and nxt.isalnum():
-                        # Add spaces around operator
-                        if result and result[-1] != " ":
-                            result.append(" ")
-                        result.append(ch)
-                        result.append(" ")
-                        i += 1
-                        continue
-                result.append(ch)
-                i += 1
-            return f"${''.join(result)}$"
-
-        content = re.sub(r"\$([^$]+)\$", enhance_inline_math, content)
-
-        return content
+        # Walk the $...$ spans with str.find; text outside them is copied as-is
+        parts: list[str] = []
+        start = 0  # first character not yet copied
+        pos = content.find("$")
+        while pos != -1:
+            end = content.find("$", pos + 1)
+            if end == -1:
+                break
+            if end == pos + 1:
+                # Nothing between the delimiters; the second one may open a span
+                pos = end
+                continue
+            parts.append(content[start : pos + 1])
+            parts.append(_space_math_operators(content[pos + 1 : end]))
+            start = end
+            pos = content.find("$", end + 1)
+        parts.append(content[start:])
+
+        return "".join(parts)
 
     def _fix_common_math_errors(self, content: str) -> str:
         """Fix common OCR errors in mathematical expressions.
@@ -352,17 +611,8 @@ class MarkdownFormatter:
         Returns:
             Content with corrected math expressions.
         """
-        # Common OCR corrections for math
-        corrections = {
-            r"([a-zA-Z])\s*\^\s*([0-9]+)": r"\1^{\2}",  # Fix superscripts
-            r"([a-zA-Z])\s*_\s*([0-9]+)": r"\1_{\2}",  # Fix subscripts
-            r"\\frac\s*\{\s*([^}]+)\s*\}\s*\{\s*([^}]+)\s*\}": r"\\frac{\1}{\2}",  # Fix fractions
-            r"\\sqrt\s*\{\s*([^}]+)\s*\}": r"\\sqrt{\1}",  # Fix square roots
-            r"\\sum\s*_\s*\{\s*([^}]+)\s*\}\s*\^\s*\{\s*([^}]+)\s*\}": r"\\sum_{{\1}}^{{\2}}",  # Fix summations
-        }
-
-        for pattern, replacement in corrections.items():
-            content = re.sub(pattern, replacement, content)
+        for pattern, replacement in _MATH_CORRECTIONS:
+            content = pattern.sub(replacement, content)
 
         return content
 
@@ -375,21 +625,13 @@ class MarkdownFormatter:
         Returns:
             Cleaned markdown content.
         """
-        # Remove excessive whitespace
-        content = re.sub(r"\n\s*\n\s*\n+", "\n\n", content)
-
-        # Fix heading formatting
-        content = re.sub(r"^(#{1,6})\s*(.+)", r"\1 \2", content, flags=re.MULTILINE)
-
-        # Ensure proper list formatting
-        content = re.sub(r"^(\s*[-*+])\s+", r"\1 ", content, flags=re.MULTILINE)
-        content = re.sub(r"^(\s*\d+\.)\s+", r"\1 ", content, flags=re.MULTILINE)
+        # Collapse blank lines, fix heading and list spacing, and remove
+        # trailing whitespace in one pass
+        content = _CLEAN_RE.sub(_clean_replacement, content)
 
         # Fix table formatting
-        content = self._fix_table_formatting(content)
-
-        # Remove trailing whitespace
-        content = re.sub(r"[ \t]+$", "", content, flags=re.MULTILINE)
+        if "|" in content:
+            content = self._fix_table_formatting(content)
 
         return content.strip()
 
@@ -443,17 +685,8 @@ class MarkdownFormatter:
         Returns:
             Final formatted markdown content.
         """
-        # Ensure proper spacing around headers
-        content = re.sub(r"(^|\n)(#{1,6}\s+[^\n]+)\n(?!\n)", r"\1\2\n\n", content)
-
-        # Ensure proper spacing around code blocks
-        content = re.sub(r"(^|\n)(```[^`]*```)\n(?!\n)", r"\1\2\n\n", content)
-
-        # Ensure proper spacing around block quotes
-        content = re.sub(r"(^|\n)(>[^\n]+)\n(?!\n)", r"\1\2\n\n", content)
-
-        # Final cleanup
-        content = re.sub(r"\n{3,}", "\n\n", content)
+        for pattern, replacement in _FINAL_FORMATTING_SUBS:
+            content = pattern.sub(replacement, content)
 
         return content.strip() + "\n"
 
@@ -466,38 +699,40 @@ class MarkdownFormatter:
         Returns:
             Dictionary with extracted metadata.
         """
+        # Each scan is skipped when its marker characters are absent
+        headers = (
+            [(len(m[1]), m[2].strip()) for m in _HEADER_RE.finditer(content)]
+            if "#" in content
+            else []
+        )
+
+        math_equations = 0
+        if "$" in content:
+            math_equations = sum(1 for _ in _INLINE_MATH_RE.finditer(content))
+            if "$$" in content:
+                math_equations += sum(1 for _ in _DISPLAY_MATH_RE.finditer(content))
+
+        images = (
+            [m[2] for m in _IMAGE_REF_RE.finditer(content)] if "![" in content else []
+        )
+        links = _LINK_RE.findall(content) if "](" in content else []
+
+        # Lines with at least two pipes are table rows
+        table_lines = (
+            {line for line in content.split("\n") if line.count("|") >= 2}
+            if "|" in content
+            else set()
+        )
+
         metadata = {
             "word_count": len(content.split()),
             "char_count": len(content),
-            "line_count": len(content.split("\n")),
-            "headers": [],
-            "math_equations": [],
-            "images": [],
-            "tables": 0,
-            "links": [],
+            "line_count": content.count("\n") + 1,
+            "headers": headers,
+            "math_equations": math_equations,
+            "images": images,
+            "tables": len(table_lines) // 2,
+            "links": links,
         }
 
-        # Extract headers
-        headers = re.findall(r"^(#{1,6})\s+(.+)$", content, re.MULTILINE)
-        metadata["headers"] = [(len(h[0]), h[1].strip()) for h in headers]
-
-        # Count math equations
-        inline_math = re.findall(r"\$[^$]+\$", content)
-        display_math = re.findall(r"\$\$[^$]+\$\$", content)
-        metadata["math_equations"] = len(inline_math) + len(display_math)
-
-        # Extract image references
-        images = re.findall(r"!\[[^\]]*\]\(([^)]+)\)", content)
-        metadata["images"] = images
-
-        # Count tables
-        table_lines = [
-            line for line in content.split("\n") if "|" in line and line.count("|") >= 2
-        ]
-        metadata["tables"] = len(set(table_lines)) // 2 if table_lines else 0
-
-        # Extract links
-        links = re.findall(r"\[([^\]]+)\]\(([^)]+)\)", content)
-        metadata["links"] = links
-
         return metadata
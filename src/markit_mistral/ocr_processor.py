@@ -7,13 +7,21 @@ to extract text from images and PDF pages.
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import collections
+import contextlib
 import logging
-import mimetypes
 import os
+import random
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from mistralai import DocumentURLChunk, ImageURLChunk, Mistral, SDKError
 
@@ -21,6 +29,7 @@ from .exceptions import (
     APIError,
     APIKeyError,
     APIQuotaError,
+    APIRateLimitError,
     FileCorruptedError,
     FileNotFoundError,
     FileTooLargeError,
@@ -28,11 +37,61 @@ from .exceptions import (
     handle_api_error,
 )
 
+# pybase64 provides SIMD base64 kernels; fall back to the stdlib otherwise
+try:
+    import pybase64 as base64
+except ImportError:  # pragma: no cover - optional accelerator
+    import base64
+
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from mistralai.types.ocr_response import OCRResponse
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Default cap on in-flight OCR requests for batch processing
+_MAX_CONCURRENT_REQUESTS = 8
+
+# Upper bound in seconds for a computed (not server-provided) retry delay
+_MAX_RETRY_DELAY = 30.0
+
+# HTTP statuses that will fail the same way however often they are retried
+_NON_RETRYABLE_STATUS = frozenset({400, 401, 403, 404, 413})
+
+# Shape of a Mistral API key; anything else is rejected before any request
+_API_KEY_RE = re.compile(r"^[A-Za-z0-9_-]{8,}$")
+
+# How often async callers re-check a full concurrency gate, in seconds
+_GATE_POLL_INTERVAL = 0.05
+
+# Length in seconds of the sliding window used for the requests-per-minute limit
+_RATE_WINDOW = 60.0
+
+# PDFs at least this large are uploaded and passed by signed URL rather than
+# inlined into the request as a base64 data URI
+_UPLOAD_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+# Lifetime in hours of the signed URL handed to OCR for an uploaded PDF
+_SIGNED_URL_EXPIRY_HOURS = 1
+
+# Default budget for cached data URIs, in bytes of encoded text
+_ENCODE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Worker threads used to decode and write extracted images
+_MAX_IMAGE_WORKERS = 16
+# Responses with up to this many images are extracted inline, without a pool
+_MAX_INLINE_IMAGES = 2
+
+# Bytes read per step when streaming a file into base64. A multiple of 3,
+# so only the final chunk can produce padding.
+_ENCODE_CHUNK_SIZE = 3 * 64 * 1024
+
+# Longest data URI header searched for the ',' that starts the payload
+_MAX_DATA_URI_HEADER = 128
+
 # Mapping of MIME subtypes to file extensions
 _MIME_TO_EXT: dict[str, str] = {
     "jpeg": ".jpg",
@@ -45,19 +104,235 @@ _MIME_TO_EXT: dict[str, str] = {
 }
 
 
+# Extensions an OCR image id may already carry
+_KNOWN_IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".svg")
+
+
+@lru_cache(maxsize=64)
 def _ext_from_data_uri_header(header: str) -> str:
     """Extract file extension from a data URI header like 'data:image/png;base64'.
 
     Returns '.jpg' as fallback if the MIME type cannot be determined.
     """
-    try:
-        # header format: "data:image/png;base64"
-        mime_part = header.split(";")[0]  # "data:image/png"
-        mime_type = mime_part.split(":", 1)[1]  # "image/png"
-        subtype = mime_type.split("/", 1)[1]  # "png"
-        return _MIME_TO_EXT.get(subtype, f".{subtype}")
-    except (IndexError, ValueError):
+    # header format: "data:image/png;base64"
+    mime_part = header.partition(";")[0]  # "data:image/png"
+    _, colon, mime_type = mime_part.partition(":")  # "image/png"
+    _, slash, subtype = mime_type.partition("/")  # "png"
+    if not (colon and slash):
         return ".jpg"
+    return _MIME_TO_EXT.get(subtype, f".{subtype}")
+
+
+def _file_to_data_uri(path: Path, mime_type: str, size: int | None = None) -> str:
+    """Stream a file into a base64 data URI.
+
+    The encoded output is written into a single pre-sized buffer, so the raw
+    file contents and a full-size intermediate encoding are never held in
+    memory at the same time.
+
+    Args:
+        path: Path to the file.
+        mime_type: MIME type for the data URI header.
+        size: File size in bytes, if already known from a stat() call.
+
+    Returns:
+        Data URI string for the file.
+    """
+    prefix = f"data:{mime_type};base64,".encode("ascii")
+    if size is None:
+        size = path.stat().st_size
+    out = bytearray(len(prefix) + (size + 2) // 3 * 4)
+    out[: len(prefix)] = prefix
+    pos = len(prefix)
+    remaining = size
+
+    chunk = bytearray(min(_ENCODE_CHUNK_SIZE, size))
+    with open(path, "rb") as f, memoryview(out) as view, memoryview(chunk) as buf:
+        while remaining:
+            n = f.readinto(buf[: min(remaining, len(buf))])
+            if not n:
+                break  # File shrank since stat()
+            encoded = base64.b64encode(buf[:n])
+            view[pos : pos + len(encoded)] = encoded
+            pos += len(encoded)
+            remaining -= n
+
+    if pos != len(out):
+        del out[pos:]
+    return out.decode("ascii")
+
+
+def _sniff_image_mime(head: bytes) -> str | None:
+    """Identify an image format from the first bytes of the file.
+
+    Returns:
+        MIME type of the image, or None if the signature is not recognized.
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith((b"II*\x00", b"MM\x00*")):
+        return "image/tiff"
+    if head.startswith(b"BM"):
+        return "image/bmp"
+    return None
+
+
+def _decode_image(image_base64: str) -> tuple[bytes, str]:
+    """Decode an OCR image payload, which may be a data URI or bare base64.
+
+    Returns:
+        Tuple of (image bytes, file extension). The extension falls back to
+        '.jpg' when the payload carries no MIME type.
+    """
+    if not image_base64.startswith("data:"):
+        return base64.b64decode(image_base64), ".jpg"
+
+    # Only the short header can hold the comma, so don't scan the payload
+    comma = image_base64.find(",", 5, _MAX_DATA_URI_HEADER)
+    if comma < 0:
+        raise ValueError("Malformed data URI: missing ',' after header")
+    image_data = base64.b64decode(image_base64[comma + 1 :], validate=False)
+    # Extract extension from MIME type
+    return image_data, _ext_from_data_uri_header(image_base64[:comma])
+
+
+@lru_cache(maxsize=4)
+def _shared_client(api_key: str) -> Mistral:
+    """Return the synchronous Mistral client for an API key.
+
+    Processors with the same key share one client, and with it one HTTP
+    connection pool, so keep-alive connections survive across processors.
+    """
+    return Mistral(api_key=api_key)
+
+
+def _retry_after_seconds(error: Exception) -> float | None:
+    """Read the Retry-After header from a failed API response.
+
+    Supports both the delay-seconds and HTTP-date forms of the header.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed.
+    """
+    response = getattr(error, "raw_response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AIMDGate:
+    """Client-side limit on in-flight OCR requests that adapts to the API.
+
+    The limit grows additively after each successful request and shrinks
+    multiplicatively after a rate-limit or server error. The gate is
+    thread-safe and not bound to an event loop, so one gate can be shared by
+    several processors and batches.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4.0,
+        c_min: int = 1,
+        c_max: int = 16,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        target_latency: float | None = None,
+    ):
+        """
+        Initialize the gate.
+
+        Args:
+            initial: Starting concurrency limit.
+            c_min: Lowest concurrency limit.
+            c_max: Highest concurrency limit.
+            alpha: Amount added to the limit after a success.
+            beta: Factor applied to the limit after an error.
+            target_latency: Successes slower than this many seconds do not
+                raise the limit. None disables the latency check.
+        """
+        self.c_min = c_min
+        self.c_max = c_max
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self.limit = float(min(max(initial, c_min), c_max))
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def capacity(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return max(self.c_min, int(self.limit))
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free, without waiting."""
+        with self._cond:
+            if self._in_flight >= self.capacity:
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self) -> None:
+        """Take a slot, blocking the calling thread until one is free."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight < self.capacity)
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Take a slot without blocking the event loop."""
+        while not self.try_acquire():
+            await asyncio.sleep(_GATE_POLL_INTERVAL)
+
+    def release(self) -> None:
+        """Return a slot taken with acquire or acquire_async."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """Record a successful request and its latency in seconds."""
+        with self._cond:
+            if self.target_latency is None or latency <= self.target_latency:
+                self.limit = min(self.c_max, self.limit + self.alpha)
+                self._cond.notify_all()
+
+    def on_error(self) -> None:
+        """Record a rate-limit or server error."""
+        with self._cond:
+            self.limit = max(self.c_min, self.limit * self.beta)
+
+    def __enter__(self) -> AIMDGate:
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+    async def __aenter__(self) -> AIMDGate:
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.release()
 
 
 class OCRProcessor:
@@ -74,6 +349,9 @@ class OCRProcessor:
         max_retries: int = 3,
         retry_delay: float = 1.0,
         max_file_size_mb: int = 50,
+        gate: AIMDGate | None = None,
+        rpm_limit: int | None = None,
+        encode_cache_bytes: int = _ENCODE_CACHE_BYTES,
     ):
         """
         Initialize the OCR processor.
@@ -83,86 +361,315 @@ class OCRProcessor:
             max_retries: Maximum number of retries for API calls.
             retry_delay: Delay between retries in seconds.
             max_file_size_mb: Maximum file size in MB.
+            gate: Adaptive concurrency gate for OCR requests. Pass the same
+                gate to several processors to share one limit between them.
+            rpm_limit: Maximum OCR requests started per minute. None disables
+                client-side throttling.
+            encode_cache_bytes: Memory budget for reusing the data URIs of
+                files that are processed again unchanged. 0 disables caching.
         """
         self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
         if not self.api_key:
             raise APIKeyError()
+        if not _API_KEY_RE.match(self.api_key):
+            raise APIKeyError("Malformed API key")
 
         try:
-            self.client = Mistral(api_key=self.api_key)
+            self.client = _shared_client(self.api_key)
         except Exception as e:
             raise APIError(f"Failed to initialize Mistral client: {e}") from e
 
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.retry_cap = _MAX_RETRY_DELAY
         self.max_file_size_mb = max_file_size_mb
         self.model = "mistral-ocr-latest"
 
-    def _encode_image_to_data_uri(self, image_path: str | Path) -> str:
+        self.gate = gate or AIMDGate()
+        self.rpm_limit = rpm_limit
+        self._req_times: collections.deque[float] = collections.deque()
+        self._req_lock = threading.Lock()
+
+        self.encode_cache_bytes = encode_cache_bytes
+        self._encode_cache: collections.OrderedDict[tuple[str, int, int], str] = (
+            collections.OrderedDict()
+        )
+        self._encode_cache_size = 0
+        self._encode_cache_lock = threading.Lock()
+
+    def _cached_file_to_data_uri(
+        self, path: Path, mime_type: str, stat: os.stat_result | None = None
+    ) -> str:
+        """Encode a file to a data URI, reusing the result for unchanged files.
+
+        Entries are keyed by resolved path, modification time and size, so an
+        edited file is always re-encoded. The least recently used entries are
+        evicted once the cache exceeds encode_cache_bytes.
+
+        Args:
+            path: Path to the file.
+            mime_type: MIME type for the data URI header.
+            stat: Result of a stat() call already made on the file.
+
+        Returns:
+            Data URI string for the file.
+        """
+        if stat is None:
+            stat = path.stat()
+        key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+        with self._encode_cache_lock:
+            cached = self._encode_cache.get(key)
+            if cached is not None:
+                self._encode_cache.move_to_end(key)
+                return cached
+
+        data_uri = _file_to_data_uri(path, mime_type, stat.st_size)
+
+        size = len(data_uri)
+        if size <= self.encode_cache_bytes:
+            with self._encode_cache_lock:
+                if key not in self._encode_cache:
+                    self._encode_cache[key] = data_uri
+                    self._encode_cache_size += size
+                while self._encode_cache_size > self.encode_cache_bytes:
+                    _, evicted = self._encode_cache.popitem(last=False)
+                    self._encode_cache_size -= len(evicted)
+
+        return data_uri
+
+    def _encode_image_to_data_uri(
+        self, image_path: str | Path, stat: os.stat_result | None = None
+    ) -> str:
         """Encode an image file to a data URI.
 
         Args:
             image_path: Path to the image file.
+            stat: Result of a stat() call already made on the file, which
+                also proves it exists.
 
         Returns:
             Data URI string for the image.
         """
         image_path = Path(image_path)
-        if not image_path.exists():
+        if stat is None and not image_path.exists():
             raise FileNotFoundError(f"Image file not found: {image_path}")
 
-        mime_type, _ = mimetypes.guess_type(str(image_path))
-        if not mime_type or not mime_type.startswith("image/"):
-            raise FileCorruptedError(str(image_path), "File is not a valid image")
-
         try:
+            # The file signature is authoritative, and checking it first
+            # rejects corrupt or mislabeled files without reading them whole
             with open(image_path, "rb") as image_file:
-                image_data = image_file.read()
+                mime_type = _sniff_image_mime(image_file.read(16))
+            if mime_type is None:
+                raise FileCorruptedError(str(image_path), "File is not a valid image")
+
+            return self._cached_file_to_data_uri(image_path, mime_type, stat)
+        except FileCorruptedError:
+            raise
         except PermissionError as e:
             raise FileCorruptedError(str(image_path), f"Permission denied: {e}") from e
-        except Exception as e:
+        except OSError as e:
             raise FileCorruptedError(
                 str(image_path), f"Failed to read image file: {e}"
             ) from e
-
-        try:
-            base64_encoded = base64.b64encode(image_data).decode("utf-8")
-            return f"data:{mime_type};base64,{base64_encoded}"
         except Exception as e:
             raise OCRProcessingError(f"Failed to encode image as base64: {e}") from e
 
-    def _encode_pdf_to_data_uri(self, pdf_path: str | Path) -> str:
+    def _encode_pdf_to_data_uri(
+        self, pdf_path: str | Path, stat: os.stat_result | None = None
+    ) -> str:
         """Encode a PDF file to a data URI.
 
         Args:
             pdf_path: Path to the PDF file.
+            stat: Result of a stat() call already made on the file, which
+                also proves it exists.
 
         Returns:
             Data URI string for the PDF.
         """
         pdf_path = Path(pdf_path)
-        if not pdf_path.exists():
+        if stat is None and not pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
         if pdf_path.suffix.lower() != ".pdf":
             raise FileCorruptedError(str(pdf_path), "File is not a PDF")
 
         try:
-            with open(pdf_path, "rb") as pdf_file:
-                pdf_data = pdf_file.read()
+            return self._cached_file_to_data_uri(pdf_path, "application/pdf", stat)
         except PermissionError as e:
             raise FileCorruptedError(str(pdf_path), f"Permission denied: {e}") from e
-        except Exception as e:
+        except OSError as e:
             raise FileCorruptedError(
                 str(pdf_path), f"Failed to read PDF file: {e}"
             ) from e
-
-        try:
-            base64_encoded = base64.b64encode(pdf_data).decode("utf-8")
-            return f"data:application/pdf;base64,{base64_encoded}"
         except Exception as e:
             raise OCRProcessingError(f"Failed to encode PDF as base64: {e}") from e
 
+    def _prepare_image(self, image_path: str | Path) -> ImageURLChunk:
+        """Validate an image file and build its OCR document configuration.
+
+        Args:
+            image_path: Path to the image file.
+
+        Returns:
+            Image chunk carrying the image as a data URI.
+        """
+        image_path = Path(image_path)
+        stat = image_path.stat()
+        file_size = stat.st_size
+        logger.debug(f"Image file size: {file_size / (1024 * 1024):.2f} MB")
+
+        # Check file size limit
+        max_size_bytes = self.max_file_size_mb * 1024 * 1024
+        if file_size > max_size_bytes:
+            raise ValueError(
+                f"Image file too large: {file_size / (1024 * 1024):.2f} MB "
+                f"(max {self.max_file_size_mb} MB)"
+            )
+
+        data_uri = self._encode_image_to_data_uri(image_path, stat)
+        return ImageURLChunk(image_url=data_uri)
+
+    def _throttle_delay(self) -> float:
+        """Reserve a start time for the next request under the RPM limit.
+
+        Start times are kept in a sliding one-minute window. When the window is
+        full, the request is scheduled for when its oldest relevant entry
+        expires, so concurrent callers each get a distinct slot.
+
+        Returns:
+            Seconds to wait before sending the request.
+        """
+        if not self.rpm_limit:
+            return 0.0
+
+        with self._req_lock:
+            now = time.monotonic()
+            times = self._req_times
+            while times and times[0] <= now - _RATE_WINDOW:
+                times.popleft()
+
+            start = now
+            if len(times) >= self.rpm_limit:
+                start = max(now, times[-self.rpm_limit] + _RATE_WINDOW)
+            times.append(start)
+            return start - now
+
+    def _next_retry_delay(
+        self, error: APIError, attempt: int, prev_delay: float | None = None
+    ) -> float | None:
+        """Return the delay before the next OCR attempt.
+
+        A server-provided Retry-After is honoured. Otherwise the delay uses
+        decorrelated jitter, so concurrent clients do not retry in lockstep.
+
+        Args:
+            error: Error raised by the failed attempt.
+            attempt: Zero-based index of the failed attempt.
+            prev_delay: Delay used before the failed attempt, if any.
+
+        Returns:
+            Delay in seconds, or None if the request should not be retried.
+        """
+        # Don't retry on certain errors
+        if isinstance(error, APIKeyError | APIQuotaError):
+            return None
+
+        if attempt >= self.max_retries - 1:
+            logger.error(f"All {self.max_retries} OCR attempts failed")
+            return None
+
+        if isinstance(error, APIRateLimitError):
+            if error.retry_after is not None:
+                return error.retry_after + random.uniform(0, 1)
+            base = self.retry_delay
+        else:
+            # Transient failures usually clear faster than rate limits
+            base = self.retry_delay / 2
+
+        prev = prev_delay or base
+        return min(self.retry_cap, random.uniform(base, prev * 3))
+
+    def _handle_attempt_error(
+        self, error: Exception, attempt: int, prev_delay: float | None = None
+    ) -> tuple[APIError, float | None]:
+        """Classify a failed OCR attempt and decide whether to retry it.
+
+        Args:
+            error: Exception raised by the attempt.
+            attempt: Zero-based index of the failed attempt.
+            prev_delay: Delay used before the failed attempt, if any.
+
+        Returns:
+            Tuple of (converted error, delay in seconds before the next
+            attempt or None if the request should not be retried).
+        """
+        api_error = handle_api_error(error)
+
+        if not isinstance(error, SDKError):
+            logger.error(f"Unexpected error during OCR: {error}")
+            return api_error, None
+
+        if getattr(error, "status_code", None) == 429 and not isinstance(
+            api_error, APIQuotaError
+        ):
+            api_error = APIRateLimitError(retry_after=_retry_after_seconds(error))
+
+        status_code = getattr(error, "status_code", None) or 0
+        if status_code in (401, 403) and not isinstance(api_error, APIKeyError):
+            api_error = APIKeyError()
+
+        # Client errors and bad credentials fail identically on every retry
+        if (
+            isinstance(api_error, APIKeyError | APIQuotaError)
+            or status_code in _NON_RETRYABLE_STATUS
+        ):
+            logger.error(f"OCR request failed with non-retryable error: {error}")
+            return api_error, None
+
+        # Back off the shared concurrency limit on API back-pressure
+        if isinstance(api_error, APIRateLimitError) or status_code >= 500:
+            self.gate.on_error()
+
+        logger.warning(f"OCR attempt {attempt + 1} failed: {error}")
+        sleep_time = self._next_retry_delay(api_error, attempt, prev_delay)
+        if sleep_time is not None:
+            logger.info(f"Retrying in {sleep_time:.2f} seconds...")
+        return api_error, sleep_time
+
+    def _call_with_retry(self, operation: Callable[[], _T], description: str) -> _T:
+        """Run a blocking API call with the OCR retry policy.
+
+        Args:
+            operation: Callable performing the API request.
+            description: Short name of the request for log messages.
+
+        Returns:
+            Result of the operation.
+
+        Raises:
+            APIError: If the call fails after all retries.
+        """
+        last_exception = None
+        sleep_time = None
+
+        for attempt in range(self.max_retries):
+            try:
+                return operation()
+            except Exception as e:
+                logger.debug(f"{description} attempt {attempt + 1} failed")
+                last_exception, sleep_time = self._handle_attempt_error(
+                    e, attempt, sleep_time
+                )
+                if sleep_time is None:
+                    break
+                time.sleep(sleep_time)
+
+        raise last_exception or OCRProcessingError(
+            f"{description} failed after all retries"
+        )
+
     def _process_with_retry(
         self,
         document_config: DocumentURLChunk | ImageURLChunk,
@@ -181,39 +688,92 @@ class OCRProcessor:
             OCRProcessingError: If processing fails after all retries.
         """
         last_exception = None
+        sleep_time = None
 
         for attempt in range(self.max_retries):
             try:
                 logger.debug(f"OCR attempt {attempt + 1}/{self.max_retries}")
 
-                response = self.client.ocr.process(
-                    model=self.model,
-                    document=document_config,
-                    include_image_base64=include_images,
-                )
+                throttle = self._throttle_delay()
+                if throttle:
+                    logger.debug(f"RPM limit reached, waiting {throttle:.2f} seconds")
+                    time.sleep(throttle)
+
+                with self.gate:
+                    start = time.monotonic()
+                    response = self.client.ocr.process(
+                        model=self.model,
+                        document=document_config,
+                        include_image_base64=include_images,
+                    )
+                self.gate.on_success(time.monotonic() - start)
 
                 logger.info(f"OCR successful on attempt {attempt + 1}")
                 return response
 
-            except SDKError as e:
-                last_exception = handle_api_error(e)
-                logger.warning(f"OCR attempt {attempt + 1} failed: {e}")
-
-                # Don't retry on certain errors
-                if isinstance(last_exception, APIKeyError | APIQuotaError):
+            except Exception as e:
+                last_exception, sleep_time = self._handle_attempt_error(
+                    e, attempt, sleep_time
+                )
+                if sleep_time is None:
                     break
+                time.sleep(sleep_time)
+
+        raise last_exception or OCRProcessingError(
+            "OCR processing failed after all retries"
+        )
+
+    async def _process_with_retry_async(
+        self,
+        client: Mistral,
+        document_config: DocumentURLChunk | ImageURLChunk,
+        include_images: bool = True,
+    ) -> OCRResponse:
+        """Process document with retry logic without blocking the event loop.
+
+        Args:
+            client: Mistral client whose async HTTP pool belongs to the
+                running event loop.
+            document_config: Document configuration for Mistral API.
+            include_images: Whether to include images in the response.
+
+        Returns:
+            OCR response from Mistral API.
+
+        Raises:
+            OCRProcessingError: If processing fails after all retries.
+        """
+        last_exception = None
+        sleep_time = None
+
+        for attempt in range(self.max_retries):
+            try:
+                logger.debug(f"OCR attempt {attempt + 1}/{self.max_retries}")
+
+                throttle = self._throttle_delay()
+                if throttle:
+                    logger.debug(f"RPM limit reached, waiting {throttle:.2f} seconds")
+                    await asyncio.sleep(throttle)
 
-                if attempt < self.max_retries - 1:
-                    sleep_time = self.retry_delay * (2**attempt)  # Exponential backoff
-                    logger.info(f"Retrying in {sleep_time} seconds...")
-                    time.sleep(sleep_time)
-                else:
-                    logger.error(f"All {self.max_retries} OCR attempts failed")
+                async with self.gate:
+                    start = time.monotonic()
+                    response = await client.ocr.process_async(
+                        model=self.model,
+                        document=document_config,
+                        include_image_base64=include_images,
+                    )
+                self.gate.on_success(time.monotonic() - start)
+
+                logger.info(f"OCR successful on attempt {attempt + 1}")
+                return response
 
             except Exception as e:
-                last_exception = handle_api_error(e)
-                logger.error(f"Unexpected error during OCR: {e}")
-                break
+                last_exception, sleep_time = self._handle_attempt_error(
+                    e, attempt, sleep_time
+                )
+                if sleep_time is None:
+                    break
+                await asyncio.sleep(sleep_time)
 
         raise last_exception or OCRProcessingError(
             "OCR processing failed after all retries"
@@ -236,12 +796,13 @@ class OCRProcessor:
         pdf_path = Path(pdf_path)
 
         try:
-            file_size = pdf_path.stat().st_size
+            stat = pdf_path.stat()
         except FileNotFoundError:
             raise FileNotFoundError(f"PDF file not found: {pdf_path}") from None
         except Exception as e:
             raise FileCorruptedError(str(pdf_path), f"Cannot access file: {e}") from e
 
+        file_size = stat.st_size
         file_size_mb = file_size / (1024 * 1024)
         logger.debug(f"PDF file size: {file_size_mb:.2f} MB")
 
@@ -250,11 +811,14 @@ class OCRProcessor:
             raise FileTooLargeError(str(pdf_path), file_size_mb, self.max_file_size_mb)
 
         try:
-            data_uri = self._encode_pdf_to_data_uri(pdf_path)
+            if file_size >= _UPLOAD_THRESHOLD_BYTES:
+                response = self._process_uploaded_pdf(pdf_path, include_images)
+            else:
+                data_uri = self._encode_pdf_to_data_uri(pdf_path, stat)
 
-            document_config = DocumentURLChunk(document_url=data_uri)
+                document_config = DocumentURLChunk(document_url=data_uri)
 
-            response = self._process_with_retry(document_config, include_images)
+                response = self._process_with_retry(document_config, include_images)
 
             logger.info(f"Successfully processed PDF with {len(response.pages)} pages")
             return response
@@ -266,6 +830,50 @@ class OCRProcessor:
             logger.error(f"Failed to process PDF {pdf_path}: {e}")
             raise OCRProcessingError(f"PDF processing failed: {e}") from e
 
+    def _process_uploaded_pdf(
+        self, pdf_path: Path, include_images: bool = True
+    ) -> OCRResponse:
+        """Process a PDF by uploading it and passing OCR a signed URL.
+
+        Large files are streamed to Mistral file storage instead of being
+        base64-encoded into the request. The uploaded file is deleted once
+        OCR finishes, whether or not it succeeded.
+
+        Args:
+            pdf_path: Path to the PDF file.
+            include_images: Whether to include extracted images in the response.
+
+        Returns:
+            OCR response containing pages with markdown text and images.
+        """
+        if pdf_path.suffix.lower() != ".pdf":
+            raise FileCorruptedError(str(pdf_path), "File is not a PDF")
+
+        def upload():
+            with open(pdf_path, "rb") as pdf_file:
+                return self.client.files.upload(
+                    file={"file_name": pdf_path.name, "content": pdf_file},
+                    purpose="ocr",
+                )
+
+        file_id = self._call_with_retry(upload, "PDF upload").id
+        logger.debug(f"Uploaded {pdf_path.name} as file {file_id}")
+
+        try:
+            signed = self._call_with_retry(
+                lambda: self.client.files.get_signed_url(
+                    file_id=file_id, expiry=_SIGNED_URL_EXPIRY_HOURS
+                ),
+                "Signed URL request",
+            )
+            document_config = DocumentURLChunk(document_url=signed.url)
+            return self._process_with_retry(document_config, include_images)
+        finally:
+            try:
+                self.client.files.delete(file_id=file_id)
+            except Exception as e:
+                logger.warning(f"Failed to delete uploaded file {file_id}: {e}")
+
     def process_image(
         self, image_path: str | Path, include_images: bool = True
     ) -> OCRResponse:
@@ -280,24 +888,54 @@ class OCRProcessor:
         """
         logger.info(f"Processing image: {image_path}")
 
-        image_path = Path(image_path)
-        file_size = image_path.stat().st_size
-        logger.debug(f"Image file size: {file_size / (1024 * 1024):.2f} MB")
+        try:
+            document_config = self._prepare_image(image_path)
 
-        # Check file size limit
-        max_size_bytes = self.max_file_size_mb * 1024 * 1024
-        if file_size > max_size_bytes:
-            raise ValueError(
-                f"Image file too large: {file_size / (1024 * 1024):.2f} MB "
-                f"(max {self.max_file_size_mb} MB)"
+            response = self._process_with_retry(document_config, include_images)
+
+            logger.info(
+                f"Successfully processed image with {len(response.pages)} pages"
             )
+            return response
+
+        except Exception as e:
+            logger.error(f"Failed to process image {image_path}: {e}")
+            raise
 
+    def _async_client(self) -> Mistral:
+        """Create a Mistral client for use within a single event loop.
+
+        The SDK binds its async HTTP connection pool to the loop it first runs
+        on, so async entry points open a fresh client with ``async with`` and
+        close it before returning instead of sharing ``self.client``.
+        """
         try:
-            data_uri = self._encode_image_to_data_uri(image_path)
+            return Mistral(api_key=self.api_key)
+        except Exception as e:
+            raise APIError(f"Failed to initialize Mistral client: {e}") from e
 
-            document_config = ImageURLChunk(image_url=data_uri)
+    async def _process_image_async(
+        self, client: Mistral, image_path: str | Path, include_images: bool
+    ) -> OCRResponse:
+        """Process an image file with the given async client.
 
-            response = self._process_with_retry(document_config, include_images)
+        Args:
+            client: Mistral client opened in the running event loop.
+            image_path: Path to the image file.
+            include_images: Whether to include the processed image in the response.
+
+        Returns:
+            OCR response containing the extracted text and image data.
+        """
+        logger.info(f"Processing image: {image_path}")
+
+        try:
+            # Reading and encoding the file blocks, so keep it off the loop
+            document_config = await asyncio.to_thread(self._prepare_image, image_path)
+
+            response = await self._process_with_retry_async(
+                client, document_config, include_images
+            )
 
             logger.info(
                 f"Successfully processed image with {len(response.pages)} pages"
@@ -308,6 +946,136 @@ class OCRProcessor:
             logger.error(f"Failed to process image {image_path}: {e}")
             raise
 
+    async def _process_pdf_async(
+        self, client: Mistral, pdf_path: str | Path, include_images: bool
+    ) -> OCRResponse:
+        """Process a PDF file with the given async client.
+
+        PDFs large enough to need uploading go through the blocking files API
+        on a worker thread instead. Raises the same exceptions as process_pdf.
+
+        Args:
+            client: Mistral client opened in the running event loop.
+            pdf_path: Path to the PDF file.
+            include_images: Whether to include extracted images in the response.
+
+        Returns:
+            OCR response containing pages with markdown text and images.
+        """
+        logger.info(f"Processing PDF: {pdf_path}")
+
+        pdf_path = Path(pdf_path)
+
+        try:
+            stat = await asyncio.to_thread(pdf_path.stat)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}") from None
+        except Exception as e:
+            raise FileCorruptedError(str(pdf_path), f"Cannot access file: {e}") from e
+
+        file_size_mb = stat.st_size / (1024 * 1024)
+        logger.debug(f"PDF file size: {file_size_mb:.2f} MB")
+
+        # Check file size limit
+        if file_size_mb > self.max_file_size_mb:
+            raise FileTooLargeError(str(pdf_path), file_size_mb, self.max_file_size_mb)
+
+        try:
+            if stat.st_size >= _UPLOAD_THRESHOLD_BYTES:
+                response = await asyncio.to_thread(
+                    self._process_uploaded_pdf, pdf_path, include_images
+                )
+            else:
+                data_uri = await asyncio.to_thread(
+                    self._encode_pdf_to_data_uri, pdf_path, stat
+                )
+                response = await self._process_with_retry_async(
+                    client, DocumentURLChunk(document_url=data_uri), include_images
+                )
+
+            logger.info(f"Successfully processed PDF with {len(response.pages)} pages")
+            return response
+
+        except (FileNotFoundError, FileCorruptedError, FileTooLargeError):
+            # Re-raise our custom exceptions
+            raise
+        except Exception as e:
+            logger.error(f"Failed to process PDF {pdf_path}: {e}")
+            raise OCRProcessingError(f"PDF processing failed: {e}") from e
+
+    async def process_image_async(
+        self, image_path: str | Path, include_images: bool = True
+    ) -> OCRResponse:
+        """Process an image file using Mistral OCR without blocking.
+
+        Args:
+            image_path: Path to the image file.
+            include_images: Whether to include the processed image in the response.
+
+        Returns:
+            OCR response containing the extracted text and image data.
+        """
+        async with self._async_client() as client:
+            return await self._process_image_async(client, image_path, include_images)
+
+    async def batch_process_async(
+        self,
+        paths: list[str | Path],
+        include_images: bool = True,
+        max_concurrency: int = _MAX_CONCURRENT_REQUESTS,
+    ) -> list[OCRResponse]:
+        """Process several image and PDF files concurrently.
+
+        All requests in the batch share one client, which is closed when the
+        batch finishes. The processor's gate may hold requests back further
+        while the API is signalling back-pressure.
+
+        Args:
+            paths: Paths to the image and PDF files.
+            include_images: Whether to include the processed images in the responses.
+            max_concurrency: Maximum number of OCR requests in flight at once.
+
+        Returns:
+            OCR responses in the same order as paths.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async with self._async_client() as client:
+
+            async def process_one(path: str | Path) -> OCRResponse:
+                async with semaphore:
+                    if Path(path).suffix.lower() == ".pdf":
+                        return await self._process_pdf_async(
+                            client, path, include_images
+                        )
+                    return await self._process_image_async(client, path, include_images)
+
+            return list(await asyncio.gather(*(process_one(p) for p in paths)))
+
+    def batch_process(
+        self,
+        paths: list[str | Path],
+        include_images: bool = True,
+        max_concurrency: int = _MAX_CONCURRENT_REQUESTS,
+    ) -> list[OCRResponse]:
+        """Process several image and PDF files concurrently from synchronous code.
+
+        Each call runs its own event loop with its own client, so repeated
+        calls on the same processor are safe. Must not be called from inside
+        a running event loop; use batch_process_async there instead.
+
+        Args:
+            paths: Paths to the image and PDF files.
+            include_images: Whether to include the processed images in the responses.
+            max_concurrency: Maximum number of OCR requests in flight at once.
+
+        Returns:
+            OCR responses in the same order as paths.
+        """
+        return asyncio.run(
+            self.batch_process_async(paths, include_images, max_concurrency)
+        )
+
     def process_url(self, url: str, include_images: bool = True) -> OCRResponse:
         """Process a document from a URL using Mistral OCR.
 
@@ -346,13 +1114,11 @@ class OCRProcessor:
         Returns:
             Concatenated text from all pages.
         """
-        text_parts = []
-
-        for page in response.pages:
-            if hasattr(page, "markdown") and page.markdown:
-                text_parts.append(page.markdown)
-
-        return "\n\n".join(text_parts)
+        return "\n\n".join(
+            markdown
+            for page in response.pages
+            if (markdown := getattr(page, "markdown", None))
+        )
 
     def extract_images(
         self,
@@ -377,84 +1143,107 @@ class OCRProcessor:
         saved_images: list[Path] = []
         rename_map: dict[str, str] = {}
 
-        # First, check if there are any images to extract
-        has_images = False
-        for page in response.pages:
-            if hasattr(page, "images") and page.images:
-                for image in page.images:
-                    if hasattr(image, "image_base64") and image.image_base64:
-                        has_images = True
-                        break
-            if has_images:
-                break
-
-        # Only create directory if we have images to save
-        if not has_images:
+        # Collect the images to extract along with their page index
+        found = [
+            (page_idx, image)
+            for page_idx, page in enumerate(response.pages)
+            if (images := getattr(page, "images", None))
+            for image in images
+            if getattr(image, "image_base64", None)
+        ]
+
+        if not found:
             logger.debug("No images found in OCR response")
             return saved_images, rename_map
 
-        # Create output directory only when needed
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        for page_idx, page in enumerate(response.pages):
-            if hasattr(page, "images") and page.images:
-                for image in page.images:
-                    if hasattr(image, "image_base64") and image.image_base64:
-                        try:
-                            # Parse the base64 data URI
-                            ext = ".jpg"  # default
-                            if image.image_base64.startswith("data:"):
-                                header, data = image.image_base64.split(",", 1)
-                                image_data = base64.b64decode(data)
-                                # Extract extension from MIME type
-                                ext = _ext_from_data_uri_header(header)
-                            else:
-                                image_data = base64.b64decode(image.image_base64)
-
-                            # Get original ID for rename mapping
-                            original_id = getattr(image, "id", None) or ""
-
-                            # Build filename: prefix takes priority for unique naming
-                            if image_prefix:
-                                filename = (
-                                    f"{image_prefix}-fig-{len(saved_images) + 1}{ext}"
-                                )
-                            elif original_id:
-                                filename = original_id
-                                # Ensure filename has a recognized image extension
-                                _known_exts = {
-                                    ".jpg",
-                                    ".jpeg",
-                                    ".png",
-                                    ".gif",
-                                    ".bmp",
-                                    ".tiff",
-                                    ".webp",
-                                    ".svg",
-                                }
-                                if not any(
-                                    filename.lower().endswith(e) for e in _known_exts
-                                ):
-                                    filename = f"{filename}{ext}"
-                            else:
-                                filename = f"page_{page_idx + 1}_image_{len(saved_images) + 1}{ext}"
-
-                            # Track rename if filename differs from original
-                            if original_id and original_id != filename:
-                                rename_map[original_id] = filename
-
-                            image_path = output_dir / filename
-
-                            with open(image_path, "wb") as f:
-                                f.write(image_data)
-
-                            saved_images.append(image_path)
-                            logger.debug(f"Saved image: {image_path}")
-
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to save image from page {page_idx + 1}: {e}"
-                            )
+        def decode(item: tuple[int, Any]) -> tuple[bytes, str] | None:
+            page_idx, image = item
+            try:
+                return _decode_image(image.image_base64)
+            except Exception as e:
+                logger.warning(f"Failed to save image from page {page_idx + 1}: {e}")
+                return None
+
+        def write(item: tuple[int, str, str, bytes, Path]) -> bool:
+            page_idx, _, _, image_data, image_path = item
+            try:
+                image_path.write_bytes(image_data)
+            except Exception as e:
+                logger.warning(f"Failed to save image from page {page_idx + 1}: {e}")
+                # Remove any partial file
+                with contextlib.suppress(OSError):
+                    image_path.unlink(missing_ok=True)
+                return False
+            logger.debug(f"Saved image: {image_path}")
+            return True
+
+        def build_filename(
+            page_idx: int, original_id: str, ext: str, number: int
+        ) -> str:
+            # Prefix takes priority for unique naming
+            if image_prefix:
+                return f"{image_prefix}-fig-{number}{ext}"
+            if original_id:
+                # Ensure filename has a recognized image extension
+                if not original_id.lower().endswith(_KNOWN_IMAGE_EXTS):
+                    return f"{original_id}{ext}"
+                return original_id
+            return f"page_{page_idx + 1}_image_{number}{ext}"
+
+        # Decoding and writing release the GIL, so both run on a thread pool
+        pool = None
+        if len(found) > _MAX_INLINE_IMAGES:
+            pool = ThreadPoolExecutor(max_workers=min(_MAX_IMAGE_WORKERS, len(found)))
+        run = pool.map if pool is not None else map
+
+        try:
+            # Provisional names in order, assuming every write succeeds
+            pending: list[tuple[int, str, str, bytes, Path]] = []
+            for (page_idx, image), decoded in zip(
+                found, run(decode, found), strict=True
+            ):
+                if decoded is None:
+                    continue
+                image_data, ext = decoded
+
+                # Get original ID for rename mapping
+                original_id = getattr(image, "id", None) or ""
+                filename = build_filename(page_idx, original_id, ext, len(pending) + 1)
+                pending.append(
+                    (page_idx, original_id, ext, image_data, output_dir / filename)
+                )
+
+            # Only create directory if we have images to save
+            if pending:
+                output_dir.mkdir(parents=True, exist_ok=True)
+
+            for (page_idx, original_id, ext, _, image_path), saved in zip(
+                pending, run(write, pending), strict=True
+            ):
+                if not saved:
+                    continue
+
+                # Numbering counts saved images, so after a failed write the
+                # later files move down to close the gap
+                filename = build_filename(
+                    page_idx, original_id, ext, len(saved_images) + 1
+                )
+                if filename != image_path.name:
+                    try:
+                        image_path = image_path.replace(output_dir / filename)
+                    except OSError as e:
+                        logger.warning(f"Failed to rename image {image_path}: {e}")
+                        with contextlib.suppress(OSError):
+                            image_path.unlink()
+                        continue
+
+                saved_images.append(image_path)
+                # Track rename if filename differs from original
+                if original_id and original_id != filename:
+                    rename_map[original_id] = filename
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
         logger.info(f"Extracted {len(saved_images)} images to {output_dir}")
         return saved_images, rename_map
@@ -487,4 +1276,4 @@ class OCRProcessor:
             raise IndexError(f"Page index {page_index} out of range")
 
         page = response.pages[page_index]
-        return page.markdown if hasattr(page, "markdown") and page.markdown else ""
+        return getattr(page, "markdown", None) or ""
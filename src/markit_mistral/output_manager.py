@@ -7,15 +7,98 @@ metadata preservation, and output format customization.
 
 import json
 import logging
+import os
+import stat
+import string
 import zipfile
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 from . import __version__
 
+# orjson serializes metadata several times faster; fall back to the stdlib
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Text outputs worth deflating; everything else (e.g. JPEG/PNG images) is
+# already compressed and is stored as-is
+_COMPRESSIBLE_SUFFIXES = frozenset({".md", ".json", ".txt", ".svg"})
+
+# Deflate level for text entries; the fastest level, since markdown and JSON
+# outputs are small and already compress well at it
+_ARCHIVE_COMPRESSLEVEL = 1
+
+# Archive entries smaller than this are read whole instead of streamed
+_WRITESTR_MAX_BYTES = 1024 * 1024
+
+# strftime formats for the time variables available to custom naming patterns
+_NAMING_TIME_FORMATS = {
+    "timestamp": "%Y%m%d_%H%M%S",
+    "date": "%Y%m%d",
+    "time": "%H%M%S",
+}
+
+
+def _dumps_json(obj: Any) -> bytes:
+    """Serialize metadata to indented UTF-8 JSON.
+
+    Values JSON has no type for, such as datetimes, are written as strings.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str
+        )
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _zip_compression(path: Path) -> int:
+    """Return the zip compression method to use for an archive entry."""
+    if path.suffix.lower() in _COMPRESSIBLE_SUFFIXES:
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED
+
+
+@lru_cache(maxsize=32)
+def _time_fields(pattern: str | None) -> frozenset[str]:
+    """Return the time variables a custom naming pattern refers to."""
+    if not pattern:
+        return frozenset()
+    try:
+        fields = {
+            name.split(".", 1)[0].split("[", 1)[0]
+            for _, name, _, _ in string.Formatter().parse(pattern)
+            if name
+        }
+    except ValueError:
+        # Malformed pattern; formatting will report it
+        return frozenset(_NAMING_TIME_FORMATS)
+    return frozenset(fields.intersection(_NAMING_TIME_FORMATS))
+
+
+def _add_to_archive(zipf: zipfile.ZipFile, path: Path, arcname: str) -> None:
+    """Add a file to an open archive with the compression suited to its type.
+
+    Files below _WRITESTR_MAX_BYTES are read in one call and added from
+    memory; larger ones are streamed by ZipFile.write.
+    """
+    info = zipfile.ZipInfo.from_file(path, arcname, strict_timestamps=False)
+    info.compress_type = _zip_compression(path)
+    if info.file_size < _WRITESTR_MAX_BYTES:
+        zipf.writestr(info, path.read_bytes(), compresslevel=_ARCHIVE_COMPRESSLEVEL)
+    else:
+        zipf.write(
+            path,
+            arcname,
+            compress_type=info.compress_type,
+            compresslevel=_ARCHIVE_COMPRESSLEVEL,
+        )
+
 
 class OutputManager:
     """
@@ -25,6 +108,9 @@ class OutputManager:
     and optional packaging of complete conversion results.
     """
 
+    # Probe-file write results per filesystem device, shared by all instances
+    _probe_results: ClassVar[dict[int, bool]] = {}
+
     def __init__(
         self,
         base_output_dir: str | Path | None = None,
@@ -101,14 +187,14 @@ class OutputManager:
         base_name = input_path.stem
 
         if self.custom_naming:
-            # Apply custom naming pattern
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            name_vars = {
-                "original": base_name,
-                "timestamp": timestamp,
-                "date": datetime.now().strftime("%Y%m%d"),
-                "time": datetime.now().strftime("%H%M%S"),
-            }
+            # Apply custom naming pattern, formatting only the times it uses.
+            # The pattern is read on each call since it may be reassigned.
+            name_vars = {"original": base_name}
+            time_fields = _time_fields(self.custom_naming)
+            if time_fields:
+                now = datetime.now()
+                for field in time_fields:
+                    name_vars[field] = now.strftime(_NAMING_TIME_FORMATS[field])
 
             try:
                 filename = self.custom_naming.format(**name_vars)
@@ -158,8 +244,7 @@ class OutputManager:
             metadata["processing_stats"] = processing_stats
 
         try:
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            metadata_path.write_bytes(_dumps_json(metadata))
 
             logger.debug(f"Saved metadata to {metadata_path}")
         except Exception as e:
@@ -190,10 +275,17 @@ class OutputManager:
                     markdown_path.parent / f"{markdown_path.stem}_complete.zip"
                 )
 
-            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            with zipfile.ZipFile(
+                archive_path,
+                "w",
+                zipfile.ZIP_DEFLATED,
+                compresslevel=_ARCHIVE_COMPRESSLEVEL,
+                strict_timestamps=False,
+            ) as zipf:
                 # Add markdown file
                 if output_structure["markdown_path"].exists():
-                    zipf.write(
+                    _add_to_archive(
+                        zipf,
                         output_structure["markdown_path"],
                         output_structure["markdown_path"].name,
                     )
@@ -203,7 +295,8 @@ class OutputManager:
                     "metadata_path" in output_structure
                     and output_structure["metadata_path"].exists()
                 ):
-                    zipf.write(
+                    _add_to_archive(
+                        zipf,
                         output_structure["metadata_path"],
                         output_structure["metadata_path"].name,
                     )
@@ -214,11 +307,14 @@ class OutputManager:
                     and output_structure["images_dir"].exists()
                 ):
                     images_dir = output_structure["images_dir"]
-                    for image_file in images_dir.iterdir():
-                        if image_file.is_file():
-                            zipf.write(
-                                image_file, f"{images_dir.name}/{image_file.name}"
-                            )
+                    with os.scandir(images_dir) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                _add_to_archive(
+                                    zipf,
+                                    Path(entry.path),
+                                    f"{images_dir.name}/{entry.name}",
+                                )
 
             logger.info(f"Created archive: {archive_path}")
             return archive_path
@@ -236,37 +332,60 @@ class OutputManager:
         """
         for temp_path in temp_paths:
             try:
-                if temp_path.exists():
-                    if temp_path.is_file():
-                        temp_path.unlink()
-                    elif temp_path.is_dir():
-                        # Remove directory and contents
-                        import shutil
-
-                        shutil.rmtree(temp_path)
-                    logger.debug(f"Cleaned up temporary file: {temp_path}")
+                # One lstat() answers both "exists" and "is it a directory"
+                try:
+                    path_stat = os.lstat(temp_path)
+                except FileNotFoundError:
+                    continue
+
+                if stat.S_ISDIR(path_stat.st_mode):
+                    # Remove directory and contents
+                    import shutil
+
+                    shutil.rmtree(temp_path)
+                else:
+                    os.unlink(temp_path)
+                logger.debug(f"Cleaned up temporary file: {temp_path}")
             except Exception as e:
                 logger.warning(f"Failed to clean up {temp_path}: {e}")
 
-    def validate_output_permissions(self, output_dir: Path) -> bool:
+    def validate_output_permissions(
+        self, output_dir: Path, probe: bool = False
+    ) -> bool:
         """
         Validate that we have write permissions to the output directory.
 
         Args:
             output_dir: Directory to check.
+            probe: Also confirm by writing a probe file, for filesystems where
+                os.access is unreliable (e.g. some NFS mounts). The probe runs
+                once per filesystem and its result is reused.
 
         Returns:
             True if we can write to the directory, False otherwise.
         """
-        try:
-            # Try to create a temporary file
-            test_file = output_dir / ".markit_mistral_test"
-            test_file.touch()
-            test_file.unlink()
+        if not os.access(output_dir, os.W_OK | os.X_OK):
+            return False
+        if not probe:
             return True
-        except Exception:
+
+        try:
+            device = os.stat(output_dir).st_dev
+        except OSError:
             return False
 
+        if device not in self._probe_results:
+            try:
+                # Try to create a temporary file
+                test_file = output_dir / ".markit_mistral_test"
+                test_file.touch()
+                test_file.unlink()
+                self._probe_results[device] = True
+            except Exception:
+                self._probe_results[device] = False
+
+        return self._probe_results[device]
+
     def get_output_summary(self, output_structure: dict[str, Path]) -> dict[str, Any]:
         """
         Generate a summary of the output files created.
@@ -284,31 +403,36 @@ class OutputManager:
         }
 
         for key, path in output_structure.items():
-            if path.exists():
-                if path.is_file():
-                    size = path.stat().st_size
+            try:
+                path_stat = path.stat()
+            except OSError:
+                continue
+
+            if stat.S_ISREG(path_stat.st_mode):
+                size = path_stat.st_size
+                summary["files_created"].append(
+                    {
+                        "type": key,
+                        "path": str(path),
+                        "size_bytes": size,
+                    }
+                )
+                summary["total_size_bytes"] += size
+            elif stat.S_ISDIR(path_stat.st_mode) and "images" in key:
+                # Count images in directory; DirEntry.is_file() needs no syscall
+                with os.scandir(path) as entries:
+                    image_files = [entry for entry in entries if entry.is_file()]
+                summary["images_count"] = len(image_files)
+
+                for entry in image_files:
+                    size = entry.stat().st_size
                     summary["files_created"].append(
                         {
-                            "type": key,
-                            "path": str(path),
+                            "type": "image",
+                            "path": entry.path,
                             "size_bytes": size,
                         }
                     )
                     summary["total_size_bytes"] += size
-                elif path.is_dir() and "images" in key:
-                    # Count images in directory
-                    image_files = [f for f in path.iterdir() if f.is_file()]
-                    summary["images_count"] = len(image_files)
-
-                    for img_file in image_files:
-                        size = img_file.stat().st_size
-                        summary["files_created"].append(
-                            {
-                                "type": "image",
-                                "path": str(img_file),
-                                "size_bytes": size,
-                            }
-                        )
-                        summary["total_size_bytes"] += size
 
         return summary
@@ -2,40 +2,51 @@
 Tests for the CLI module.
 """
 
-import tempfile
+import subprocess
+import sys
 from pathlib import Path
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 from markit_mistral.cli import create_parser, main
 
 
+@pytest.fixture(scope="module")
+def parser():
+    """Build the CLI parser once; parse_args does not modify it."""
+    return create_parser()
+
+
 class TestCLIParser:
     """Test cases for CLI argument parser."""
 
-    def test_create_parser(self):
+    def test_parser_import_skips_sdk(self):
+        """Test that importing the CLI does not load the Mistral SDK."""
+        code = "import sys, markit_mistral.cli; print('mistralai' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "False"
+
+    def test_create_parser(self, parser):
         """Test parser creation."""
-        parser = create_parser()
         assert parser.prog == "markit-mistral"
 
-    def test_version_argument(self):
+    def test_version_argument(self, parser):
         """Test version argument."""
-        parser = create_parser()
-
         with pytest.raises(SystemExit):
             parser.parse_args(["--version"])
 
-    def test_help_argument(self):
+    def test_help_argument(self, parser):
         """Test help argument."""
-        parser = create_parser()
-
         with pytest.raises(SystemExit):
             parser.parse_args(["--help"])
 
-    def test_basic_arguments(self):
+    def test_basic_arguments(self, parser):
         """Test basic argument parsing."""
-        parser = create_parser()
         args = parser.parse_args(["input.pdf"])
 
         assert args.input == "input.pdf"
@@ -43,338 +54,171 @@ class TestCLIParser:
         assert args.verbose is False
         assert args.quiet is False
 
-    def test_output_argument(self):
-        """Test output argument."""
-        parser = create_parser()
-        args = parser.parse_args(["input.pdf", "-o", "output.md"])
+    @pytest.mark.parametrize(
+        ("argv", "attr", "expected"),
+        [
+            (["-o", "output.md"], "output", "output.md"),
+            (["--extract-images"], "extract_images", True),
+            (["--no-images"], "no_images", True),
+            (["--base64-images"], "base64_images", True),
+            (["--no-metadata"], "no_metadata", True),
+            (["--create-archive"], "create_archive", True),
+            (["--output-format", "json"], "output_format", "json"),
+            (["--verbose"], "verbose", True),
+            (["--quiet"], "quiet", True),
+            (["--api-key", "test-key"], "api_key", "test-key"),
+        ],
+    )
+    def test_option_arguments(self, parser, argv, attr, expected):
+        """Test that each option sets its attribute."""
+        args = parser.parse_args(["input.pdf", *argv])
 
         assert args.input == "input.pdf"
-        assert args.output == "output.md"
-
-    def test_image_arguments(self):
-        """Test image-related arguments."""
-        parser = create_parser()
-
-        # Test extract images
-        args = parser.parse_args(["input.pdf", "--extract-images"])
-        assert args.extract_images is True
-
-        # Test no images
-        args = parser.parse_args(["input.pdf", "--no-images"])
-        assert args.no_images is True
-
-        # Test base64 images
-        args = parser.parse_args(["input.pdf", "--base64-images"])
-        assert args.base64_images is True
+        assert getattr(args, attr) == expected
 
-    def test_output_management_arguments(self):
-        """Test output management arguments."""
-        parser = create_parser()
 
-        # Test metadata arguments
-        args = parser.parse_args(["input.pdf", "--no-metadata"])
-        assert args.no_metadata is True
+@pytest.fixture(scope="session")
+def input_pdf(tmp_path_factory):
+    """Create an empty input PDF shared by CLI tests.
 
-        # Test archive creation
-        args = parser.parse_args(["input.pdf", "--create-archive"])
-        assert args.create_archive is True
-
-        # Test output format
-        args = parser.parse_args(["input.pdf", "--output-format", "json"])
-        assert args.output_format == "json"
-
-    def test_verbose_quiet_arguments(self):
-        """Test verbose and quiet arguments."""
-        parser = create_parser()
-
-        # Test verbose
-        args = parser.parse_args(["input.pdf", "--verbose"])
-        assert args.verbose is True
-
-        # Test quiet
-        args = parser.parse_args(["input.pdf", "--quiet"])
-        assert args.quiet is True
-
-    def test_api_key_argument(self):
-        """Test API key argument."""
-        parser = create_parser()
-        args = parser.parse_args(["input.pdf", "--api-key", "test-key"])
-
-        assert args.api_key == "test-key"
-
-    def test_no_metadata_argument(self):
-        """Test no-metadata argument."""
-        parser = create_parser()
-        args = parser.parse_args(["input.pdf", "--no-metadata"])
-
-        assert args.no_metadata is True
+    The converter is mocked, so tests only check that the file exists.
+    """
+    input_file = tmp_path_factory.mktemp("cli") / "test.pdf"
+    input_file.touch()
+    return input_file
 
 
 class TestCLIMain:
     """Test cases for CLI main function."""
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_with_file_input(self, mock_config_class, mock_converter_class):
-        """Test main function with file input."""
-        # Setup mocks
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
+    @pytest.fixture(autouse=True)
+    def cli_mocks(self, monkeypatch):
+        """Replace the config and converter classes used by main()."""
+        mocks = SimpleNamespace(config=Mock(), converter=Mock())
 
-        mock_converter = Mock()
-        mock_converter_class.return_value = mock_converter
-        mock_converter.file_processor.is_supported.return_value = True
+        # The converted file is only read back for stdout, so no file is needed
+        output_file = MagicMock(spec=Path)
+        output_file.read_text.return_value = "# Test Output\n\nThis is test content."
+        mocks.converter.convert_file.return_value = output_file
+        config_class = Mock()
+        config_class.from_env.return_value = mocks.config
+        converter_class = Mock(return_value=mocks.converter)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "test.pdf"
-            input_file.touch()  # Create empty file
+        monkeypatch.setattr("markit_mistral.cli.Config", config_class)
+        monkeypatch.setattr("markit_mistral.converter.MarkItMistral", converter_class)
+        return mocks
 
-            # Create actual output file that CLI can read
-            output_file = temp_path / "output.md"
-            output_file.write_text("# Test Output\n\nThis is test content.")
-            mock_converter.convert_file.return_value = output_file
+    def test_main_with_file_input(self, cli_mocks, input_pdf, capsys):
+        """Test main function with file input."""
+        mock_converter = cli_mocks.converter
+        mock_converter.file_processor.is_supported.return_value = True
 
-            with patch("sys.argv", ["markit-mistral", str(input_file)]):
-                result = main()
+        result = main([str(input_pdf)])
 
-                assert result == 0
-                mock_converter.convert_file.assert_called_once()
+        assert result == 0
+        mock_converter.convert_file.assert_called_once()
+        assert capsys.readouterr().out == "# Test Output\n\nThis is test content."
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_file_not_found(self, mock_config_class, _mock_converter_class):
+    def test_main_file_not_found(self):
         """Test main function with non-existent file."""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
-
-        with patch("sys.argv", ["markit-mistral", "nonexistent.pdf"]):
-            result = main()
+        result = main(["nonexistent.pdf"])
 
-            assert result == 1
+        assert result == 1
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_unsupported_file(self, mock_config_class, mock_converter_class):
+    def test_main_unsupported_file(self, cli_mocks, tmp_path):
         """Test main function with unsupported file type."""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
-
-        mock_converter = Mock()
-        mock_converter_class.return_value = mock_converter
+        mock_converter = cli_mocks.converter
         mock_converter.file_processor.is_supported.return_value = False
         mock_converter.file_processor.get_supported_extensions.return_value = [
             ".pdf",
             ".png",
         ]
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "test.txt"
-            input_file.touch()
+        input_file = tmp_path / "test.txt"
+        input_file.touch()
 
-            with patch("sys.argv", ["markit-mistral", str(input_file)]):
-                result = main()
+        result = main([str(input_file)])
 
-                assert result == 1
+        assert result == 1
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
     @patch("sys.stdin")
-    def test_main_stdin_tty(self, mock_stdin, mock_config_class, _mock_converter_class):
+    def test_main_stdin_tty(self, mock_stdin):
         """Test main function with stdin from TTY."""
         mock_stdin.isatty.return_value = True
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
 
-        with patch("sys.argv", ["markit-mistral"]):
-            result = main()
+        result = main([])
 
-            assert result == 1
+        assert result == 1
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
     @patch("sys.stdin")
-    def test_main_stdin_empty(
-        self, mock_stdin, mock_config_class, _mock_converter_class
-    ):
+    def test_main_stdin_empty(self, mock_stdin):
         """Test main function with empty stdin."""
         mock_stdin.isatty.return_value = False
         mock_stdin.buffer.read.return_value = b""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
 
-        with patch("sys.argv", ["markit-mistral"]):
-            result = main()
+        result = main([])
 
-            assert result == 1
+        assert result == 1
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_with_verbose(self, mock_config_class, mock_converter_class):
+    def test_main_with_verbose(self, cli_mocks, input_pdf):
         """Test main function with verbose flag."""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
-
-        mock_converter = Mock()
-        mock_converter_class.return_value = mock_converter
+        mock_converter = cli_mocks.converter
         mock_converter.file_processor.is_supported.return_value = True
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "test.pdf"
-            input_file.touch()
+        result = main([str(input_pdf), "--verbose"])
 
-            # Create actual output file that CLI can read
-            output_file = temp_path / "output.md"
-            output_file.write_text("# Test Output\n\nThis is test content.")
-            mock_converter.convert_file.return_value = output_file
+        assert result == 0
+        assert cli_mocks.config.log_level == "DEBUG"
 
-            with (
-                patch("sys.argv", ["markit-mistral", str(input_file), "--verbose"]),
-                patch("traceback.print_exc"),
-            ):
-                result = main()
-
-                assert result == 0
-                assert mock_config.log_level == "DEBUG"
-
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_with_quiet(self, mock_config_class, mock_converter_class):
+    def test_main_with_quiet(self, cli_mocks, input_pdf):
         """Test main function with quiet flag."""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
-
-        mock_converter = Mock()
-        mock_converter_class.return_value = mock_converter
+        mock_converter = cli_mocks.converter
         mock_converter.file_processor.is_supported.return_value = True
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "test.pdf"
-            input_file.touch()
-
-            # Create actual output file that CLI can read
-            output_file = temp_path / "output.md"
-            output_file.write_text("# Test Output\n\nThis is test content.")
-            mock_converter.convert_file.return_value = output_file
-
-            with patch("sys.argv", ["markit-mistral", str(input_file), "--quiet"]):
-                result = main()
+        result = main([str(input_pdf), "--quiet"])
 
-                assert result == 0
-                assert mock_config.log_level == "ERROR"
+        assert result == 0
+        assert cli_mocks.config.log_level == "ERROR"
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_with_no_images(self, mock_config_class, mock_converter_class):
+    def test_main_with_no_images(self, cli_mocks, input_pdf):
         """Test main function with no-images flag."""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
-
-        mock_converter = Mock()
-        mock_converter_class.return_value = mock_converter
+        mock_converter = cli_mocks.converter
         mock_converter.file_processor.is_supported.return_value = True
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "test.pdf"
-            input_file.touch()
-
-            # Create actual output file that CLI can read
-            output_file = temp_path / "output.md"
-            output_file.write_text("# Test Output\n\nThis is test content.")
-            mock_converter.convert_file.return_value = output_file
-
-            with patch("sys.argv", ["markit-mistral", str(input_file), "--no-images"]):
-                result = main()
+        result = main([str(input_pdf), "--no-images"])
 
-                assert result == 0
-                assert mock_config.include_images is False
+        assert result == 0
+        assert cli_mocks.config.include_images is False
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_with_output_management(self, mock_config_class, mock_converter_class):
+    def test_main_with_output_management(self, cli_mocks, input_pdf):
         """Test main function with output management flags."""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
-
-        mock_converter = Mock()
-        mock_converter.output_manager = Mock()
-        mock_converter_class.return_value = mock_converter
+        mock_converter = cli_mocks.converter
         mock_converter.file_processor.is_supported.return_value = True
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "test.pdf"
-            input_file.touch()
-
-            # Create actual output file that CLI can read
-            output_file = temp_path / "output.md"
-            output_file.write_text("# Test Output\n\nThis is test content.")
-            mock_converter.convert_file.return_value = output_file
-
-            with patch(
-                "sys.argv",
-                [
-                    "markit-mistral",
-                    str(input_file),
-                    "--no-metadata",
-                    "--create-archive",
-                ],
-            ):
-                result = main()
-
-                assert result == 0
-                assert mock_converter.output_manager.preserve_metadata is False
-                assert mock_converter.output_manager.create_zip_archive is True
-
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_exception_handling(self, mock_config_class, mock_converter_class):
-        """Test main function exception handling."""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
+        result = main([str(input_pdf), "--no-metadata", "--create-archive"])
 
-        mock_converter = Mock()
-        mock_converter_class.return_value = mock_converter
+        assert result == 0
+        assert mock_converter.output_manager.preserve_metadata is False
+        assert mock_converter.output_manager.create_zip_archive is True
+
+    def test_main_exception_handling(self, cli_mocks, input_pdf):
+        """Test main function exception handling."""
+        mock_converter = cli_mocks.converter
         mock_converter.file_processor.is_supported.return_value = True
         mock_converter.convert_file.side_effect = Exception("Test error")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "test.pdf"
-            input_file.touch()
-
-            with patch("sys.argv", ["markit-mistral", str(input_file)]):
-                result = main()
+        result = main([str(input_pdf)])
 
-                assert result == 1
+        assert result == 1
 
-    @patch("markit_mistral.cli.MarkItMistral")
-    @patch("markit_mistral.cli.Config")
-    def test_main_exception_handling_verbose(
-        self, mock_config_class, mock_converter_class
-    ):
+    def test_main_exception_handling_verbose(self, cli_mocks, input_pdf, capsys):
         """Test main function exception handling with verbose output."""
-        mock_config = Mock()
-        mock_config_class.from_env.return_value = mock_config
-
-        mock_converter = Mock()
-        mock_converter_class.return_value = mock_converter
+        mock_converter = cli_mocks.converter
         mock_converter.file_processor.is_supported.return_value = True
         mock_converter.convert_file.side_effect = Exception("Test error")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "test.pdf"
-            input_file.touch()
-
-            with (
-                patch("sys.argv", ["markit-mistral", str(input_file), "--verbose"]),
-                patch("traceback.print_exc"),
-            ):
-                result = main()
+        result = main([str(input_pdf), "--verbose"])
 
-                assert result == 1
+        assert result == 1
+        # Verbose mode prints the full traceback instead of a friendly message
+        assert "Traceback" in capsys.readouterr().err
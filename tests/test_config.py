@@ -1,6 +1,5 @@
 """Tests for the configuration module."""
 
-import os
 import tempfile
 from pathlib import Path
 
@@ -24,7 +23,7 @@ class TestConfig:
         assert config.base64_images is False
         assert config.log_level == "INFO"
 
-    def test_from_env_with_defaults(self):
+    def test_from_env_with_defaults(self, monkeypatch):
         """Test creating config from environment with no env vars set."""
         # Clear any existing environment variables
         env_vars = [
@@ -32,120 +31,98 @@ class TestConfig:
             "MARKIT_MISTRAL_MAX_RETRIES",
             "MARKIT_MISTRAL_RETRY_DELAY",
             "MARKIT_MISTRAL_MAX_FILE_SIZE_MB",
+            "MARKIT_MISTRAL_RPM_LIMIT",
             "MARKIT_MISTRAL_INCLUDE_IMAGES",
             "MARKIT_MISTRAL_PRESERVE_MATH",
             "MARKIT_MISTRAL_BASE64_IMAGES",
             "MARKIT_MISTRAL_LOG_LEVEL",
             "MARKIT_MISTRAL_TEMP_DIR",
         ]
-
-        original_values = {}
         for var in env_vars:
-            original_values[var] = os.environ.get(var)
-            if var in os.environ:
-                del os.environ[var]
-
-        try:
-            config = Config.from_env()
-
-            assert config.mistral_api_key is None
-            assert config.max_retries == 3
-            assert config.retry_delay == 1.0
-            assert config.max_file_size_mb == 50
-            assert config.include_images is True
-            assert config.preserve_math is True
-            assert config.base64_images is False
-            assert config.log_level == "INFO"
-            assert config.temp_dir is None
-
-        finally:
-            # Restore original environment
-            for var, value in original_values.items():
-                if value is not None:
-                    os.environ[var] = value
-
-    def test_from_env_with_values(self):
+            monkeypatch.delenv(var, raising=False)
+
+        config = Config.from_env()
+
+        assert config.mistral_api_key is None
+        assert config.max_retries == 3
+        assert config.retry_delay == 1.0
+        assert config.max_file_size_mb == 50
+        assert config.rpm_limit is None
+        assert config.include_images is True
+        assert config.preserve_math is True
+        assert config.base64_images is False
+        assert config.log_level == "INFO"
+        assert config.temp_dir is None
+
+    def test_from_env_with_values(self, monkeypatch):
         """Test creating config from environment with values set."""
         env_values = {
             "MISTRAL_API_KEY": "test-key",
             "MARKIT_MISTRAL_MAX_RETRIES": "5",
             "MARKIT_MISTRAL_RETRY_DELAY": "2.5",
             "MARKIT_MISTRAL_MAX_FILE_SIZE_MB": "100",
+            "MARKIT_MISTRAL_RPM_LIMIT": "60",
             "MARKIT_MISTRAL_INCLUDE_IMAGES": "false",
             "MARKIT_MISTRAL_PRESERVE_MATH": "false",
             "MARKIT_MISTRAL_BASE64_IMAGES": "true",
             "MARKIT_MISTRAL_LOG_LEVEL": "debug",
             "MARKIT_MISTRAL_TEMP_DIR": "/tmp/test",
         }
-
-        # Save original values
-        original_values = {}
-        for var in env_values:
-            original_values[var] = os.environ.get(var)
-
-        try:
-            # Set test values
-            for var, value in env_values.items():
-                os.environ[var] = value
-
-            config = Config.from_env()
-
-            assert config.mistral_api_key == "test-key"
-            assert config.max_retries == 5
-            assert config.retry_delay == 2.5
-            assert config.max_file_size_mb == 100
-            assert config.include_images is False
-            assert config.preserve_math is False
-            assert config.base64_images is True
-            assert config.log_level == "DEBUG"
-            assert config.temp_dir == Path("/tmp/test")
-
-        finally:
-            # Restore original environment
-            for var, value in original_values.items():
-                if value is not None:
-                    os.environ[var] = value
-                elif var in os.environ:
-                    del os.environ[var]
+        for var, value in env_values.items():
+            monkeypatch.setenv(var, value)
+
+        config = Config.from_env()
+
+        assert config.mistral_api_key == "test-key"
+        assert config.max_retries == 5
+        assert config.retry_delay == 2.5
+        assert config.max_file_size_mb == 100
+        assert config.rpm_limit == 60
+        assert config.include_images is False
+        assert config.preserve_math is False
+        assert config.base64_images is True
+        assert config.log_level == "DEBUG"
+        assert config.temp_dir == Path("/tmp/test")
 
     def test_validate_success(self):
         """Test successful validation."""
         config = Config(mistral_api_key="test-key")
         config.validate()  # Should not raise
 
-    def test_validate_missing_api_key(self):
-        """Test validation fails with missing API key."""
-        config = Config()
-
-        with pytest.raises(ValueError, match="Mistral API key is required"):
-            config.validate()
-
-    def test_validate_invalid_retries(self):
-        """Test validation fails with invalid max_retries."""
-        config = Config(mistral_api_key="test-key", max_retries=0)
-
-        with pytest.raises(ValueError, match="max_retries must be at least 1"):
-            config.validate()
-
-    def test_validate_invalid_retry_delay(self):
-        """Test validation fails with invalid retry_delay."""
-        config = Config(mistral_api_key="test-key", retry_delay=-1.0)
-
-        with pytest.raises(ValueError, match="retry_delay must be non-negative"):
-            config.validate()
-
-    def test_validate_invalid_file_size(self):
-        """Test validation fails with invalid max_file_size_mb."""
-        config = Config(mistral_api_key="test-key", max_file_size_mb=0)
-
-        with pytest.raises(ValueError, match="max_file_size_mb must be at least 1"):
-            config.validate()
-
-    def test_validate_invalid_log_level(self):
-        """Test validation fails with invalid log level."""
-        config = Config(mistral_api_key="test-key", log_level="INVALID")
-
-        with pytest.raises(ValueError, match="Invalid log level: INVALID"):
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            pytest.param(
+                {"mistral_api_key": None},
+                "Mistral API key is required",
+                id="missing-api-key",
+            ),
+            pytest.param(
+                {"max_retries": 0}, "max_retries must be at least 1", id="retries"
+            ),
+            pytest.param(
+                {"retry_delay": -1.0},
+                "retry_delay must be non-negative",
+                id="retry-delay",
+            ),
+            pytest.param(
+                {"max_file_size_mb": 0},
+                "max_file_size_mb must be at least 1",
+                id="file-size",
+            ),
+            pytest.param(
+                {"rpm_limit": 0}, "rpm_limit must be at least 1", id="rpm-limit"
+            ),
+            pytest.param(
+                {"log_level": "INVALID"}, "Invalid log level: INVALID", id="log-level"
+            ),
+        ],
+    )
+    def test_validate_invalid(self, kwargs, match):
+        """Test validation fails when one setting is invalid."""
+        config = Config(**{"mistral_api_key": "test-key", **kwargs})
+
+        with pytest.raises(ValueError, match=match):
             config.validate()
 
     def test_get_temp_dir(self):
@@ -1,107 +1,152 @@
 """Tests for the converter module's image prefix generation."""
 
-import tempfile
+import io
 from pathlib import Path
-from unittest.mock import Mock
+from types import SimpleNamespace
+from unittest.mock import patch
 
-from markit_mistral.converter import _content_hash, generate_image_prefix
+import pytest
+
+from markit_mistral.converter import (
+    _cached_content_hash,
+    _content_hash,
+    _content_hash_stream,
+    generate_image_prefix,
+)
 
 
 class TestContentHash:
     """Test file content hashing."""
 
     def test_returns_hex_string(self):
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
-            f.write(b"some pdf content")
-            f.flush()
-            h = _content_hash(Path(f.name))
+        h = _content_hash_stream(io.BytesIO(b"some pdf content"))
         assert len(h) == 6
         assert all(c in "0123456789abcdef" for c in h)
 
     def test_different_content_different_hash(self):
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f1:
-            f1.write(b"content A")
-            f1.flush()
-            h1 = _content_hash(Path(f1.name))
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f2:
-            f2.write(b"content B")
-            f2.flush()
-            h2 = _content_hash(Path(f2.name))
+        h1 = _content_hash_stream(io.BytesIO(b"content A"))
+        h2 = _content_hash_stream(io.BytesIO(b"content B"))
         assert h1 != h2
 
     def test_same_content_same_hash(self):
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f1:
-            f1.write(b"identical")
-            f1.flush()
-            h1 = _content_hash(Path(f1.name))
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f2:
-            f2.write(b"identical")
-            f2.flush()
-            h2 = _content_hash(Path(f2.name))
+        h1 = _content_hash_stream(io.BytesIO(b"identical"))
+        h2 = _content_hash_stream(io.BytesIO(b"identical"))
         assert h1 == h2
 
     def test_custom_length(self):
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
-            f.write(b"data")
-            f.flush()
-            h = _content_hash(Path(f.name), length=10)
+        h = _content_hash_stream(io.BytesIO(b"data"), length=10)
         assert len(h) == 10
 
+    def test_file_matches_stream(self, tmp_path):
+        path = tmp_path / "paper.pdf"
+        path.write_bytes(b"some pdf content")
+        assert _content_hash(path) == _content_hash_stream(
+            io.BytesIO(b"some pdf content")
+        )
+
+    def test_unchanged_file_is_read_once(self, tmp_path):
+        _cached_content_hash.cache_clear()
+        path = tmp_path / "paper.pdf"
+        path.write_bytes(b"cached")
+
+        h1 = _content_hash(path)
+        h2 = _content_hash(path)
+
+        assert h1 == h2
+        assert _cached_content_hash.cache_info().hits == 1
+
+    def test_chunked_fallback_matches_file_digest(self):
+        data = b"x" * 3000
+        expected = _content_hash_stream(io.BytesIO(data), 12)
+
+        with patch("markit_mistral.converter._file_digest", None):
+            assert _content_hash_stream(io.BytesIO(data), 12) == expected
+
+    def test_modified_file_is_rehashed(self, tmp_path):
+        path = tmp_path / "paper.pdf"
+        path.write_bytes(b"before")
+        h1 = _content_hash(path)
+
+        path.write_bytes(b"after edit")
+        h2 = _content_hash(path)
+
+        assert h1 != h2
+
 
 class TestGenerateImagePrefix:
     """Test robust image prefix generation with fallback chain."""
 
-    def _make_page(self, markdown: str) -> Mock:
-        page = Mock()
-        page.markdown = markdown
-        return page
+    def _make_page(self, markdown: str) -> SimpleNamespace:
+        # generate_image_prefix only reads .markdown, so no Mock is needed
+        return SimpleNamespace(markdown=markdown)
+
+    @pytest.fixture(autouse=True)
+    def _use_tmp_path(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.file_count = 0
 
     def _make_file(self, content: bytes = b"pdf data", name: str = "paper.pdf") -> Path:
-        d = tempfile.mkdtemp()
-        p = Path(d) / name
+        # A directory per file keeps the requested name, which the prefix uses
+        self.file_count += 1
+        d = self.tmp_path / str(self.file_count)
+        d.mkdir()
+        p = d / name
         p.write_bytes(content)
         return p
 
-    def test_uses_meaningful_h1_title(self):
-        pages = [self._make_page("# Treatment of Alzheimer's Disease\n\nContent.")]
-        inp = self._make_file()
-        out = Path("/tmp/output.md")
+    @pytest.mark.parametrize(
+        ("markdown", "input_name", "output_name", "expected_slug"),
+        [
+            pytest.param(
+                ["# Treatment of Alzheimer's Disease\n\nContent."],
+                "paper.pdf",
+                "output.md",
+                "treatment-of-alzheimers-disease",
+                id="meaningful-h1",
+            ),
+            pytest.param(
+                ["# Introduction\n\n## Neural Network Architecture\n\nContent."],
+                "paper.pdf",
+                "output.md",
+                "neural-network-architecture",
+                id="trivial-h1-uses-h2",
+            ),
+            pytest.param(
+                ["# Abstract\n\nSome text."],
+                "alzheimers-treatment-2024.pdf",
+                "output.md",
+                "alzheimers-treatment-2024",
+                id="trivial-heading-uses-filename",
+            ),
+            pytest.param(
+                ["# Introduction\n\nSome text."],
+                "document.pdf",
+                "my-paper.md",
+                "my-paper",
+                id="generic-filename-uses-output-stem",
+            ),
+            pytest.param(
+                ["Just plain text, no headings."],
+                "research-paper.pdf",
+                "output.md",
+                "research-paper",
+                id="no-heading-uses-filename",
+            ),
+            pytest.param(
+                [], "my-thesis.pdf", "output.md", "my-thesis", id="empty-pages"
+            ),
+        ],
+    )
+    def test_prefix_fallback_chain(
+        self, markdown, input_name, output_name, expected_slug
+    ):
+        pages = [self._make_page(md) for md in markdown]
+        inp = self._make_file(name=input_name)
+        out = Path("/tmp") / output_name
         prefix = generate_image_prefix(pages, inp, out)
-        assert prefix.startswith("treatment-of-alzheimers-disease-")
-        # Has hash suffix
-        assert len(prefix.split("-")[-1]) == 6
-
-    def test_skips_introduction_uses_h2(self):
-        pages = [
-            self._make_page(
-                "# Introduction\n\n## Neural Network Architecture\n\nContent."
-            )
-        ]
-        inp = self._make_file()
-        out = Path("/tmp/output.md")
-        prefix = generate_image_prefix(pages, inp, out)
-        assert "neural-network-architecture" in prefix
-
-    def test_skips_trivial_uses_filename(self):
-        pages = [self._make_page("# Abstract\n\nSome text.")]
-        inp = self._make_file(name="alzheimers-treatment-2024.pdf")
-        out = Path("/tmp/output.md")
-        prefix = generate_image_prefix(pages, inp, out)
-        assert "alzheimers-treatment-2024" in prefix
-
-    def test_generic_filename_uses_output_stem(self):
-        pages = [self._make_page("# Introduction\n\nSome text.")]
-        inp = self._make_file(name="document.pdf")
-        out = Path("/tmp/my-paper.md")
-        prefix = generate_image_prefix(pages, inp, out)
-        assert "my-paper" in prefix
-
-    def test_no_heading_uses_filename(self):
-        pages = [self._make_page("Just plain text, no headings.")]
-        inp = self._make_file(name="research-paper.pdf")
-        out = Path("/tmp/output.md")
-        prefix = generate_image_prefix(pages, inp, out)
-        assert "research-paper" in prefix
+        slug, short_hash = prefix.rsplit("-", 1)
+        assert slug == expected_slug
+        assert len(short_hash) == 6
 
     def test_different_files_different_prefixes(self):
         pages = [self._make_page("# Same Title\n\nContent.")]
@@ -114,13 +159,6 @@ class TestGenerateImagePrefix:
         assert prefix_a != prefix_b
         assert prefix_a.rsplit("-", 1)[0] == prefix_b.rsplit("-", 1)[0]
 
-    def test_empty_pages(self):
-        pages = []
-        inp = self._make_file(name="my-thesis.pdf")
-        out = Path("/tmp/output.md")
-        prefix = generate_image_prefix(pages, inp, out)
-        assert "my-thesis" in prefix
-
     def test_hash_suffix_always_present(self):
         pages = [self._make_page("# Good Title\n\nContent.")]
         inp = self._make_file()
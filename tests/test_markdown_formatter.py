@@ -1,11 +1,13 @@
 """Tests for the markdown formatter module."""
 
+import base64
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock
+from types import SimpleNamespace
 
 from markit_mistral.markdown_formatter import (
     MarkdownFormatter,
+    _image_to_data_uri,
     _is_trivial_heading,
     extract_title_from_markdown,
     title_to_slug,
@@ -52,6 +54,14 @@ class TestMarkdownFormatter:
         result = formatter._enhance_math_formatting(content)
         assert "$E = mc^2$" in result or "$E=mc^2$" in result  # Should add spaces
 
+    def test_process_math_equations_without_delimiters(self):
+        """Test that OCR math fixes still apply to text outside delimiters."""
+        formatter = MarkdownFormatter()
+
+        assert formatter._process_math_equations("Plain prose.") == "Plain prose."
+        result = formatter._process_math_equations("Area grows as r ^ 2 here.")
+        assert result == "Area grows as r^{2} here."
+
     def test_fix_common_math_errors(self):
         """Test common math error fixing."""
         formatter = MarkdownFormatter()
@@ -80,6 +90,14 @@ class TestMarkdownFormatter:
         result = formatter._clean_markdown_content(content)
         assert result == "# Heading without space"
 
+    def test_clean_markdown_content_combined(self):
+        """Test whitespace, heading and list fixes applied together."""
+        formatter = MarkdownFormatter()
+
+        content = "##Methods  \n\n\n\n-   first\t\n  *  second\n1.   third   \n"
+        result = formatter._clean_markdown_content(content)
+        assert result == "## Methods\n\n- first\n  * second\n1. third"
+
     def test_fix_table_formatting(self):
         """Test table formatting fixes."""
         formatter = MarkdownFormatter()
@@ -102,6 +120,33 @@ class TestMarkdownFormatter:
         assert "![Image 1](images/image1.png)" in result
         assert "![Chart](images/chart.jpg)" in result
 
+    def test_update_image_references_prefers_exact_match(self):
+        """Test that an exact or basename match beats an earlier substring match."""
+        formatter = MarkdownFormatter()
+
+        image_map = {"fig.png": "images/fig.png", "bigfig.png": "images/bigfig.png"}
+
+        content = "![Big](bigfig.png) ![Nested](scans/bigfig.png) ![Small](fig.png)"
+        result = formatter._update_image_references(content, image_map)
+
+        assert result == (
+            "![Big](images/bigfig.png) ![Nested](images/bigfig.png) "
+            "![Small](images/fig.png)"
+        )
+
+    def test_update_image_references_keeps_unmatched(self):
+        """Test that references with no matching image are left unchanged."""
+        formatter = MarkdownFormatter()
+
+        resolved: dict[str, str | None] = {}
+        content = "![Missing](other.gif)"
+        result = formatter._update_image_references(
+            content, {"chart.jpg": "images/chart.jpg"}, resolved
+        )
+
+        assert result == content
+        assert resolved == {"other.gif": None}
+
     def test_extract_metadata(self):
         """Test metadata extraction."""
         formatter = MarkdownFormatter()
@@ -137,6 +182,41 @@ $$F = ma$$
         assert metadata["tables"] >= 1
         assert len(metadata["links"]) >= 1
 
+    def test_extract_metadata_constructs_on_one_line(self):
+        """Test that constructs sharing a line are each counted."""
+        formatter = MarkdownFormatter()
+
+        content = "# Energy $E=mc^2$\n\n$$\nF = ma\n$$\n\n![Fig](fig.png) [Ref](r.md)\n"
+        metadata = formatter.extract_metadata(content)
+
+        assert metadata["headers"] == [(1, "Energy $E=mc^2$")]
+        # The display block also matches the inline pattern
+        assert metadata["math_equations"] == 3
+        assert metadata["images"] == ["fig.png"]
+        assert metadata["links"] == [("Fig", "fig.png"), ("Ref", "r.md")]
+
+    def test_extract_metadata_linked_image(self):
+        """Test that an image wrapped in a link is still counted."""
+        formatter = MarkdownFormatter()
+
+        metadata = formatter.extract_metadata("[![img](a.png)](https://x)\n")
+
+        assert metadata["images"] == ["a.png"]
+        assert metadata["links"] == [("![img", "a.png")]
+
+    def test_extract_metadata_currency_around_image_and_link(self):
+        """Test that dollar amounts do not hide images and links between them."""
+        formatter = MarkdownFormatter()
+
+        content = (
+            "The grant was $5 million, see ![budget](fig1.png) and "
+            "[report](r.pdf) for the $2 million remainder.\n"
+        )
+        metadata = formatter.extract_metadata(content)
+
+        assert metadata["images"] == ["fig1.png"]
+        assert metadata["links"] == [("budget", "fig1.png"), ("report", "r.pdf")]
+
     def test_create_image_map_file_paths(self):
         """Test creating image map with file paths."""
         formatter = MarkdownFormatter(base64_images=False)
@@ -159,16 +239,107 @@ $$F = ma$$
             assert image_map["image1.png"] == "images/image1.png"
             assert image_map["chart.jpg"] == "images/chart.jpg"
 
+    def test_create_image_map_base64(self):
+        """Test creating image map with base64 data URIs."""
+        formatter = MarkdownFormatter(base64_images=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+
+            image_paths = []
+            for i in range(4):
+                img = output_dir / f"image{i}.png"
+                img.write_bytes(f"png-{i}".encode())
+                image_paths.append(img)
+
+            image_map = formatter._create_image_map(image_paths, output_dir)
+
+            for i in range(4):
+                encoded = base64.b64encode(f"png-{i}".encode()).decode()
+                assert image_map[f"image{i}.png"] == f"data:image/png;base64,{encoded}"
+
+    def test_create_image_map_base64_inline(self):
+        """Test base64 encoding of a batch small enough to skip the pool."""
+        formatter = MarkdownFormatter(base64_images=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            img = output_dir / "chart.jpg"
+            img.write_bytes(b"jpeg data")
+
+            image_map = formatter._create_image_map(
+                [img], output_dir, rename_map={"img-0.jpeg": "chart.jpg"}
+            )
+
+            encoded = base64.b64encode(b"jpeg data").decode()
+            expected = f"data:image/jpeg;base64,{encoded}"
+            assert image_map["chart.jpg"] == expected
+            assert image_map["img-0.jpeg"] == expected
+
+    def test_create_image_map_base64_failure_falls_back_to_path(self):
+        """Test that an image that cannot be read maps to its relative path."""
+        formatter = MarkdownFormatter(base64_images=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            images_dir = output_dir / "images"
+            images_dir.mkdir()
+
+            image_paths = []
+            for i in range(3):
+                img = images_dir / f"image{i}.png"
+                img.write_bytes(b"png")
+                image_paths.append(img)
+            # Never written to disk, so encoding fails
+            missing = images_dir / "missing.png"
+
+            image_map = formatter._create_image_map([*image_paths, missing], output_dir)
+
+            assert image_map["missing.png"] == "images/missing.png"
+            assert image_map["image0.png"].startswith("data:image/png;base64,")
+
+    def test_create_image_map_base64_reencodes_changed_file(self):
+        """Test that cached encodings are invalidated when a file changes."""
+        formatter = MarkdownFormatter(base64_images=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            img = output_dir / "figure.png"
+
+            img.write_bytes(b"first")
+            first = formatter._create_image_map([img], output_dir)["figure.png"]
+            img.write_bytes(b"second version")
+            second = formatter._create_image_map([img], output_dir)["figure.png"]
+
+            assert first.endswith(base64.b64encode(b"first").decode())
+            assert second.endswith(base64.b64encode(b"second version").decode())
+
+    def test_create_image_map_base64_cache_respects_byte_budget(self):
+        """Test that cached encodings are evicted beyond the byte budget."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            image_paths = []
+            for i in range(3):
+                img = output_dir / f"image{i}.png"
+                img.write_bytes(bytes([i]) * 30)
+                image_paths.append(img)
+            entry_size = len(_image_to_data_uri(image_paths[0]))
+            formatter = MarkdownFormatter(
+                base64_images=True, data_uri_cache_bytes=2 * entry_size
+            )
+
+            formatter._create_image_map(image_paths, output_dir)
+
+            assert len(formatter._data_uri_cache) == 2
+            assert formatter._data_uri_cache_size == 2 * entry_size
+
     def test_format_document_simple(self):
         """Test simple document formatting."""
         formatter = MarkdownFormatter()
 
-        # Mock page objects
-        page1 = Mock()
-        page1.markdown = "# Page 1\n\nThis is page 1 content."
+        page1 = SimpleNamespace(markdown="# Page 1\n\nThis is page 1 content.")
 
-        page2 = Mock()
-        page2.markdown = "# Page 2\n\nThis is page 2 content."
+        page2 = SimpleNamespace(markdown="# Page 2\n\nThis is page 2 content.")
 
         pages = [page1, page2]
         image_paths = []
@@ -226,53 +397,51 @@ class TestTitleExtraction:
     """Test title extraction from markdown pages."""
 
     def test_extract_title_from_first_heading(self):
-        page = Mock()
-        page.markdown = "# Treatment of Alzheimer's Disease\n\nSome content."
+        page = SimpleNamespace(
+            markdown="# Treatment of Alzheimer's Disease\n\nSome content."
+        )
         assert extract_title_from_markdown([page]) == "Treatment of Alzheimer's Disease"
 
     def test_extract_title_no_heading(self):
-        page = Mock()
-        page.markdown = "No heading here, just text."
+        page = SimpleNamespace(markdown="No heading here, just text.")
         assert extract_title_from_markdown([page]) is None
 
     def test_extract_title_empty_pages(self):
         assert extract_title_from_markdown([]) is None
 
     def test_extract_title_falls_back_to_h2(self):
-        page = Mock()
-        page.markdown = "## Detailed Methods Section\n\nContent."
+        page = SimpleNamespace(markdown="## Detailed Methods Section\n\nContent.")
         assert extract_title_from_markdown([page]) == "Detailed Methods Section"
 
     def test_extract_title_from_second_page(self):
-        page1 = Mock()
-        page1.markdown = "Just a paragraph."
-        page2 = Mock()
-        page2.markdown = "# Title on Page Two\n\nContent."
+        page1 = SimpleNamespace(markdown="Just a paragraph.")
+        page2 = SimpleNamespace(markdown="# Title on Page Two\n\nContent.")
         assert extract_title_from_markdown([page1, page2]) == "Title on Page Two"
 
     def test_extract_title_skips_introduction(self):
-        page = Mock()
-        page.markdown = "# Introduction\n\n## Neural Network Architecture\n\nContent."
+        page = SimpleNamespace(
+            markdown="# Introduction\n\n## Neural Network Architecture\n\nContent."
+        )
         assert extract_title_from_markdown([page]) == "Neural Network Architecture"
 
     def test_extract_title_skips_abstract(self):
-        page = Mock()
-        page.markdown = "# Abstract\n\nSome abstract text."
+        page = SimpleNamespace(markdown="# Abstract\n\nSome abstract text.")
         assert extract_title_from_markdown([page]) is None
 
     def test_extract_title_skips_numbered_introduction(self):
-        page = Mock()
-        page.markdown = "# 1. Introduction\n\n## Real Title Here\n\nContent."
+        page = SimpleNamespace(
+            markdown="# 1. Introduction\n\n## Real Title Here\n\nContent."
+        )
         assert extract_title_from_markdown([page]) == "Real Title Here"
 
     def test_extract_title_prefers_h1_over_h2(self):
-        page = Mock()
-        page.markdown = "## Sub heading\n\n# Main Title\n\nContent."
+        page = SimpleNamespace(markdown="## Sub heading\n\n# Main Title\n\nContent.")
         assert extract_title_from_markdown([page]) == "Main Title"
 
     def test_extract_title_only_trivial_headings_returns_none(self):
-        page = Mock()
-        page.markdown = "# Introduction\n\n## Abstract\n\n## References\n\nContent."
+        page = SimpleNamespace(
+            markdown="# Introduction\n\n## Abstract\n\n## References\n\nContent."
+        )
         assert extract_title_from_markdown([page]) is None
 
 
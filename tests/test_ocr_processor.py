@@ -1,6 +1,33 @@
 """Tests for OCR processor helper functions."""
 
-from markit_mistral.ocr_processor import _ext_from_data_uri_header
+import asyncio
+import base64
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from mistralai import SDKError
+from PIL import Image
+
+from markit_mistral.exceptions import (
+    APIError,
+    APIKeyError,
+    APIQuotaError,
+    APIRateLimitError,
+    FileCorruptedError,
+    OCRProcessingError,
+)
+from markit_mistral.ocr_processor import (
+    _ENCODE_CHUNK_SIZE,
+    AIMDGate,
+    OCRProcessor,
+    _ext_from_data_uri_header,
+    _file_to_data_uri,
+    _shared_client,
+)
 
 
 class TestExtFromDataUriHeader:
@@ -32,3 +59,560 @@ class TestExtFromDataUriHeader:
 
     def test_empty_header_returns_jpg(self):
         assert _ext_from_data_uri_header("") == ".jpg"
+
+
+class TestFileToDataUri:
+    """Test streaming base64 encoding of files."""
+
+    @pytest.mark.parametrize(
+        "size",
+        [
+            0,
+            1,
+            2,
+            3,
+            _ENCODE_CHUNK_SIZE - 1,
+            _ENCODE_CHUNK_SIZE + 1,
+            2 * _ENCODE_CHUNK_SIZE + 2,
+        ],
+    )
+    def test_matches_whole_buffer_encoding(self, tmp_path, size):
+        data = os.urandom(size)
+        path = tmp_path / "blob.pdf"
+        path.write_bytes(data)
+
+        expected = "data:application/pdf;base64," + base64.b64encode(data).decode()
+        assert _file_to_data_uri(path, "application/pdf") == expected
+
+
+class TestEncodeCache:
+    """Test reuse of encoded data URIs."""
+
+    def test_unchanged_file_encoded_once(self, tmp_path):
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"%PDF-1.4")
+        processor = OCRProcessor(api_key="test-key")
+
+        with patch(
+            "markit_mistral.ocr_processor._file_to_data_uri", wraps=_file_to_data_uri
+        ) as encode:
+            first = processor._encode_pdf_to_data_uri(path)
+            second = processor._encode_pdf_to_data_uri(path)
+
+        assert first == second
+        assert encode.call_count == 1
+
+    def test_modified_file_reencoded(self, tmp_path):
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"%PDF-1.4")
+        processor = OCRProcessor(api_key="test-key")
+        first = processor._encode_pdf_to_data_uri(path)
+
+        path.write_bytes(b"%PDF-1.7 changed")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+
+        assert processor._encode_pdf_to_data_uri(path) != first
+
+    def test_cache_respects_byte_budget(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"doc{i}.pdf"
+            path.write_bytes(bytes([i]) * 30)
+            paths.append(path)
+        entry_size = len(_file_to_data_uri(paths[0], "application/pdf"))
+        processor = OCRProcessor(api_key="test-key", encode_cache_bytes=2 * entry_size)
+
+        for path in paths:
+            processor._encode_pdf_to_data_uri(path)
+
+        assert len(processor._encode_cache) == 2
+        assert processor._encode_cache_size == 2 * entry_size
+
+
+class TestImageValidation:
+    """Test image type detection from file signatures."""
+
+    def test_mime_type_taken_from_signature(self, tmp_path):
+        path = tmp_path / "mislabeled.png"
+        path.write_bytes(b"\xff\xd8\xff\xe0" + b"0" * 32)
+        processor = OCRProcessor(api_key="test-key")
+
+        data_uri = processor._encode_image_to_data_uri(path)
+
+        assert data_uri.startswith("data:image/jpeg;base64,")
+
+    def test_unrecognized_signature_rejected(self, tmp_path):
+        path = tmp_path / "corrupt.png"
+        path.write_bytes(b"not an image at all")
+        processor = OCRProcessor(api_key="test-key")
+
+        with pytest.raises(FileCorruptedError, match="not a valid image"):
+            processor._encode_image_to_data_uri(path)
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    """Write a handful of small real PNG files."""
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"page_{i}.png"
+        Image.new("RGB", (4, 4), color=(i * 40, 0, 0)).save(path)
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def mock_mistral():
+    """Patch the Mistral client class used by OCRProcessor."""
+    _shared_client.cache_clear()
+    with patch("markit_mistral.ocr_processor.Mistral") as mistral_class:
+        client = MagicMock()
+        client.__aenter__.return_value = client
+        client.ocr.process_async = AsyncMock()
+        mistral_class.return_value = client
+        yield mistral_class
+    _shared_client.cache_clear()
+
+
+def _sdk_error(
+    message: str, status_code: int, headers: dict[str, str] | None = None
+) -> SDKError:
+    return SDKError(message, httpx.Response(status_code, headers=headers))
+
+
+def _response(**fields) -> SimpleNamespace:
+    return SimpleNamespace(pages=[], **fields)
+
+
+class TestSharedClient:
+    """Test reuse of the synchronous Mistral client."""
+
+    def test_processors_share_sync_client(self, mock_mistral):
+        first = OCRProcessor(api_key="test-key")
+        second = OCRProcessor(api_key="test-key")
+
+        assert first.client is second.client
+        assert mock_mistral.call_count == 1
+
+
+class TestBatchProcess:
+    """Test concurrent image batch processing."""
+
+    def test_results_returned_in_input_order(self, image_paths, mock_mistral):
+        processor = OCRProcessor(api_key="test-key")
+        index_by_uri = {
+            processor._prepare_image(p).image_url: i for i, p in enumerate(image_paths)
+        }
+
+        async def process_async(**kwargs):
+            index = index_by_uri[kwargs["document"].image_url]
+            # Later requests finish first
+            await asyncio.sleep(0.01 * (len(image_paths) - index))
+            return _response(index=index)
+
+        mock_mistral.return_value.ocr.process_async.side_effect = process_async
+
+        results = processor.batch_process(image_paths, max_concurrency=len(image_paths))
+
+        assert [r.index for r in results] == list(range(len(image_paths)))
+
+    def test_mixed_pdf_and_image_batch(self, image_paths, tmp_path, mock_mistral):
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        documents = []
+
+        async def process_async(**kwargs):
+            documents.append(kwargs["document"])
+            return _response()
+
+        mock_mistral.return_value.ocr.process_async.side_effect = process_async
+        processor = OCRProcessor(api_key="test-key")
+
+        results = processor.batch_process([pdf_path, image_paths[0]])
+
+        assert len(results) == 2
+        urls = sorted(
+            getattr(d, "document_url", None) or d.image_url for d in documents
+        )
+        assert urls[0].startswith("data:application/pdf;base64,")
+        assert urls[1].startswith("data:image/png;base64,")
+
+    def test_concurrency_cap_holds(self, image_paths, mock_mistral):
+        in_flight = 0
+        peak = 0
+
+        async def process_async(**_kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _response()
+
+        mock_mistral.return_value.ocr.process_async.side_effect = process_async
+        processor = OCRProcessor(api_key="test-key")
+
+        results = processor.batch_process(image_paths, max_concurrency=2)
+
+        assert len(results) == len(image_paths)
+        assert peak == 2
+
+    def test_repeated_batches_use_fresh_clients(self, image_paths, mock_mistral):
+        client = mock_mistral.return_value
+        response = _response()
+        client.ocr.process_async.return_value = response
+        processor = OCRProcessor(api_key="test-key")
+        clients_after_init = mock_mistral.call_count
+
+        assert processor.batch_process(image_paths[:2]) == [response, response]
+        assert processor.batch_process(image_paths[:2]) == [response, response]
+
+        # One client per batch, each closed when its event loop finishes
+        assert mock_mistral.call_count == clients_after_init + 2
+        assert client.__aexit__.await_count == 2
+
+    def test_pdf_api_failure_raises_processing_error(self, tmp_path, mock_mistral):
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        process_async = mock_mistral.return_value.ocr.process_async
+        process_async.side_effect = _sdk_error("Unauthorized", 401)
+        processor = OCRProcessor(api_key="test-key", max_retries=3, retry_delay=0)
+
+        # Same exception type as the synchronous process_pdf
+        with pytest.raises(OCRProcessingError, match="PDF processing failed"):
+            processor.batch_process([pdf_path])
+
+    @pytest.mark.usefixtures("mock_mistral")
+    def test_missing_pdf_raises_like_sync_path(self, tmp_path):
+        processor = OCRProcessor(api_key="test-key")
+        missing = tmp_path / "missing.pdf"
+
+        with pytest.raises(FileCorruptedError) as sync_error:
+            processor.process_pdf(missing)
+        with pytest.raises(FileCorruptedError) as batch_error:
+            processor.batch_process([missing])
+
+        assert str(batch_error.value) == str(sync_error.value)
+
+
+class TestAIMDGate:
+    """Test the adaptive concurrency gate."""
+
+    def test_additive_increase_multiplicative_decrease(self):
+        gate = AIMDGate(initial=4, c_min=1, c_max=5, alpha=0.5, beta=0.5)
+
+        gate.on_success(0.1)
+        gate.on_success(0.1)
+        assert gate.capacity == 5
+        gate.on_success(0.1)
+        assert gate.limit == 5
+
+        gate.on_error()
+        assert gate.capacity == 2
+        for _ in range(5):
+            gate.on_error()
+        assert gate.capacity == 1
+
+    def test_slow_success_does_not_increase(self):
+        gate = AIMDGate(initial=2, target_latency=1.0)
+
+        gate.on_success(5.0)
+
+        assert gate.limit == 2
+
+    def test_slots_limited_by_capacity(self):
+        gate = AIMDGate(initial=2)
+
+        assert gate.try_acquire()
+        assert gate.try_acquire()
+        assert not gate.try_acquire()
+        gate.release()
+        assert gate.try_acquire()
+
+    def test_rate_limit_shrinks_processor_gate(self):
+        gate = AIMDGate(initial=8)
+        processor = OCRProcessor(api_key="test-key", gate=gate)
+
+        processor._handle_attempt_error(_sdk_error("Too many requests", 429), 0)
+        processor._handle_attempt_error(_sdk_error("Bad request", 400), 0)
+
+        assert gate.capacity == 4
+
+    def test_batch_respects_gate(self, image_paths, mock_mistral):
+        in_flight = 0
+        peak = 0
+
+        async def process_async(**_kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _response()
+
+        mock_mistral.return_value.ocr.process_async.side_effect = process_async
+        gate = AIMDGate(initial=1, c_max=1)
+        processor = OCRProcessor(api_key="test-key", gate=gate)
+
+        processor.batch_process(image_paths, max_concurrency=4)
+
+        assert peak == 1
+
+
+class TestThrottle:
+    """Test the client-side requests-per-minute throttle."""
+
+    def test_no_limit_never_waits(self):
+        processor = OCRProcessor(api_key="test-key")
+
+        assert all(processor._throttle_delay() == 0 for _ in range(100))
+
+    def test_full_window_schedules_after_oldest_expires(self):
+        processor = OCRProcessor(api_key="test-key", rpm_limit=2)
+
+        with patch("markit_mistral.ocr_processor.time.monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            assert processor._throttle_delay() == 0
+            monotonic.return_value = 110.0
+            assert processor._throttle_delay() == 0
+            monotonic.return_value = 120.0
+            assert processor._throttle_delay() == 40.0
+            # Concurrent callers get distinct slots
+            assert processor._throttle_delay() == 50.0
+            monotonic.return_value = 230.0
+            assert processor._throttle_delay() == 0
+
+
+class TestPdfUpload:
+    """Test the upload path for large PDFs."""
+
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        path = tmp_path / "paper.pdf"
+        path.write_bytes(b"%PDF-1.4\n" + b"0" * 64)
+        return path
+
+    def test_large_pdf_uploaded_and_deleted(self, pdf_path, mock_mistral):
+        client = mock_mistral.return_value
+        client.files.upload.return_value = SimpleNamespace(id="file-1")
+        client.files.get_signed_url.return_value = SimpleNamespace(url="https://x/y")
+        client.ocr.process.return_value = _response()
+        processor = OCRProcessor(api_key="test-key")
+
+        with patch("markit_mistral.ocr_processor._UPLOAD_THRESHOLD_BYTES", 1):
+            processor.process_pdf(pdf_path)
+
+        document = client.ocr.process.call_args.kwargs["document"]
+        assert document.document_url == "https://x/y"
+        client.files.delete.assert_called_once_with(file_id="file-1")
+
+    def test_uploaded_file_deleted_when_ocr_fails(self, pdf_path, mock_mistral):
+        client = mock_mistral.return_value
+        client.files.upload.return_value = SimpleNamespace(id="file-1")
+        client.files.get_signed_url.return_value = SimpleNamespace(url="https://x/y")
+        client.ocr.process.side_effect = _sdk_error("Unauthorized", 401)
+        processor = OCRProcessor(api_key="test-key")
+
+        with (
+            patch("markit_mistral.ocr_processor._UPLOAD_THRESHOLD_BYTES", 1),
+            pytest.raises(OCRProcessingError),
+        ):
+            processor.process_pdf(pdf_path)
+
+        client.files.delete.assert_called_once_with(file_id="file-1")
+
+    def test_small_pdf_sent_inline(self, pdf_path, mock_mistral):
+        client = mock_mistral.return_value
+        client.ocr.process.return_value = _response()
+        processor = OCRProcessor(api_key="test-key")
+
+        processor.process_pdf(pdf_path)
+
+        document = client.ocr.process.call_args.kwargs["document"]
+        assert document.document_url.startswith("data:application/pdf;base64,")
+        client.files.upload.assert_not_called()
+
+
+def _ocr_image(payload: str, image_id: str = "") -> SimpleNamespace:
+    return SimpleNamespace(id=image_id, image_base64=payload)
+
+
+class TestExtractImages:
+    """Test saving images from an OCR response."""
+
+    PNG_URI = "data:image/png;base64," + base64.b64encode(b"png-bytes").decode()
+
+    def test_images_saved_in_order_with_prefix(self, tmp_path):
+        response = SimpleNamespace(
+            pages=[
+                SimpleNamespace(images=[_ocr_image(self.PNG_URI, f"img-{i}")])
+                for i in range(5)
+            ]
+        )
+        processor = OCRProcessor(api_key="test-key")
+
+        saved, rename_map = processor.extract_images(response, tmp_path, "paper")
+
+        assert [p.name for p in saved] == [f"paper-fig-{i}.png" for i in range(1, 6)]
+        assert all(p.read_bytes() == b"png-bytes" for p in saved)
+        assert rename_map["img-0"] == "paper-fig-1.png"
+
+    def test_failed_write_skipped_without_gap(self, tmp_path):
+        response = SimpleNamespace(
+            pages=[
+                SimpleNamespace(images=[_ocr_image(self.PNG_URI, f"img-{i}")])
+                for i in range(5)
+            ]
+        )
+        processor = OCRProcessor(api_key="test-key")
+        write_bytes = Path.write_bytes
+
+        def flaky_write_bytes(path, data):
+            if path.name == "paper-fig-2.png":
+                raise OSError("disk full")
+            return write_bytes(path, data)
+
+        with patch.object(Path, "write_bytes", flaky_write_bytes):
+            saved, rename_map = processor.extract_images(response, tmp_path, "paper")
+
+        assert [p.name for p in saved] == [f"paper-fig-{i}.png" for i in range(1, 5)]
+        assert all(p.read_bytes() == b"png-bytes" for p in saved)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [p.name for p in saved]
+        # The failed image gets no rename entry pointing at a missing file
+        assert rename_map == {
+            "img-0": "paper-fig-1.png",
+            "img-2": "paper-fig-2.png",
+            "img-3": "paper-fig-3.png",
+            "img-4": "paper-fig-4.png",
+        }
+
+    def test_undecodable_image_skipped_without_gap(self, tmp_path):
+        response = SimpleNamespace(
+            pages=[
+                SimpleNamespace(
+                    images=[
+                        _ocr_image(self.PNG_URI),
+                        _ocr_image("data:image/png;base64-no-comma"),
+                        _ocr_image(self.PNG_URI),
+                    ]
+                )
+            ]
+        )
+        processor = OCRProcessor(api_key="test-key")
+
+        saved, _ = processor.extract_images(response, tmp_path)
+
+        assert [p.name for p in saved] == ["page_1_image_1.png", "page_1_image_2.png"]
+
+    def test_only_undecodable_images_creates_no_directory(self, tmp_path):
+        response = SimpleNamespace(
+            pages=[SimpleNamespace(images=[_ocr_image("data:image/png;base64")])]
+        )
+        processor = OCRProcessor(api_key="test-key")
+
+        saved, _ = processor.extract_images(response, tmp_path / "images")
+
+        assert saved == []
+        assert not (tmp_path / "images").exists()
+
+    def test_no_images_creates_no_directory(self, tmp_path):
+        response = SimpleNamespace(pages=[SimpleNamespace(images=[])])
+        processor = OCRProcessor(api_key="test-key")
+
+        saved, _ = processor.extract_images(response, tmp_path / "images")
+
+        assert saved == []
+        assert not (tmp_path / "images").exists()
+
+
+class TestRetry:
+    """Test OCR retry and backoff behaviour."""
+
+    def test_next_retry_delay_uses_decorrelated_jitter(self):
+        processor = OCRProcessor(api_key="test-key", max_retries=5, retry_delay=1.0)
+        error = APIRateLimitError()
+
+        with patch("markit_mistral.ocr_processor.random.uniform") as uniform:
+            uniform.side_effect = lambda _low, high: high
+            first = processor._next_retry_delay(error, 0)
+            second = processor._next_retry_delay(error, 1, first)
+            third = processor._next_retry_delay(error, 2, second)
+            capped = processor._next_retry_delay(error, 3, third)
+
+        assert (first, second, third) == (3.0, 9.0, 27.0)
+        assert capped == processor.retry_cap
+        assert processor._next_retry_delay(error, 4, third) is None
+
+    def test_next_retry_delay_transient_errors_use_shorter_base(self):
+        processor = OCRProcessor(api_key="test-key", retry_delay=1.0)
+
+        for _ in range(50):
+            delay = processor._next_retry_delay(APIError("Request timed out"), 0)
+            assert 0.5 <= delay <= 1.5
+
+    def test_next_retry_delay_honours_retry_after(self):
+        processor = OCRProcessor(api_key="test-key", retry_delay=1.0)
+        error = APIRateLimitError(retry_after=45)
+
+        delay = processor._next_retry_delay(error, 0)
+
+        # Server-provided delays are not clamped to the computed-delay cap
+        assert 45 <= delay <= 46
+
+    def test_rate_limit_response_reads_retry_after_header(self):
+        processor = OCRProcessor(api_key="test-key")
+        error = _sdk_error("Too many requests", 429, headers={"Retry-After": "7"})
+
+        api_error, delay = processor._handle_attempt_error(error, 0)
+
+        assert isinstance(api_error, APIRateLimitError)
+        assert api_error.retry_after == 7
+        assert 7 <= delay <= 8
+
+    def test_next_retry_delay_skips_key_and_quota_errors(self):
+        processor = OCRProcessor(api_key="test-key")
+
+        assert processor._next_retry_delay(APIKeyError(), 0) is None
+        assert processor._next_retry_delay(APIQuotaError(), 0) is None
+
+    def test_async_retry_then_success(self, image_paths, mock_mistral):
+        response = _response()
+        process_async = mock_mistral.return_value.ocr.process_async
+        process_async.side_effect = [_sdk_error("Service unavailable", 503), response]
+        processor = OCRProcessor(api_key="test-key", max_retries=3, retry_delay=0.5)
+
+        with (
+            patch(
+                "markit_mistral.ocr_processor.asyncio.sleep", new=AsyncMock()
+            ) as sleep,
+            patch("markit_mistral.ocr_processor.random.uniform", return_value=0.4),
+        ):
+            result = asyncio.run(processor.process_image_async(image_paths[0]))
+
+        assert result is response
+        assert process_async.await_count == 2
+        sleep.assert_awaited_once_with(0.4)
+
+    @pytest.mark.parametrize("status_code", [400, 403, 404, 413])
+    def test_client_errors_not_retried(self, status_code):
+        processor = OCRProcessor(api_key="test-key", max_retries=3)
+
+        _, delay = processor._handle_attempt_error(
+            _sdk_error("Request failed", status_code), 0
+        )
+
+        assert delay is None
+
+    def test_malformed_api_key_rejected(self):
+        with pytest.raises(APIKeyError, match="Malformed"):
+            OCRProcessor(api_key="not a key")
+
+    def test_async_non_retryable_error_stops(self, image_paths, mock_mistral):
+        process_async = mock_mistral.return_value.ocr.process_async
+        process_async.side_effect = _sdk_error("Unauthorized", 401)
+        processor = OCRProcessor(api_key="test-key", max_retries=3, retry_delay=0)
+
+        with pytest.raises(APIKeyError):
+            asyncio.run(processor.process_image_async(image_paths[0]))
+
+        assert process_async.await_count == 1
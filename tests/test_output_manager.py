@@ -108,6 +108,33 @@ class TestOutputManager:
 
             assert filename == temp_path / "document_20240101_120000.md"
 
+    @patch("markit_mistral.output_manager.datetime")
+    def test_generate_output_filename_pattern_changed_after_init(self, mock_datetime):
+        """Test a naming pattern assigned after construction is honored."""
+        mock_datetime.now.return_value.strftime.return_value = "20240101"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            input_path = temp_path / "paper.pdf"
+
+            manager = OutputManager()
+            manager.custom_naming = "{original}_{date}"
+            filename = manager._generate_output_filename(input_path, temp_path)
+
+            assert filename == temp_path / "paper_20240101.md"
+
+    @patch("markit_mistral.output_manager.datetime")
+    def test_generate_output_filename_skips_unused_times(self, mock_datetime):
+        """Test the clock is not read when the pattern has no time variables."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            input_path = temp_path / "document.pdf"
+
+            manager = OutputManager(custom_naming="{original}_converted")
+            manager._generate_output_filename(input_path, temp_path)
+
+            mock_datetime.now.assert_not_called()
+
     def test_save_metadata(self):
         """Test metadata saving."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -137,6 +164,22 @@ class TestOutputManager:
             assert saved_metadata["content_metadata"] == conversion_metadata
             assert saved_metadata["processing_stats"] == processing_stats
 
+    def test_save_metadata_stringifies_non_json_values(self):
+        """Test metadata values without a JSON type are saved as strings."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metadata_path = Path(temp_dir) / "metadata.json"
+            manager = OutputManager(preserve_metadata=True)
+
+            manager.save_metadata(
+                metadata_path=metadata_path,
+                conversion_metadata={"title": "Über"},
+                input_info={"path": Path("in.pdf")},
+            )
+
+            saved_metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            assert saved_metadata["input_file"] == {"path": "in.pdf"}
+            assert saved_metadata["content_metadata"] == {"title": "Über"}
+
     def test_save_metadata_disabled(self):
         """Test that metadata is not saved when disabled."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -189,6 +232,16 @@ class TestOutputManager:
                 assert "test_metadata.json" in names
                 assert "test_images/image1.jpg" in names
 
+                assert zipf.read("test.md") == b"# Test Document"
+                assert zipf.read("test_images/image1.jpg") == b"fake image data"
+
+                # Text is deflated; already-compressed images are stored
+                assert zipf.getinfo("test.md").compress_type == zipfile.ZIP_DEFLATED
+                assert (
+                    zipf.getinfo("test_images/image1.jpg").compress_type
+                    == zipfile.ZIP_STORED
+                )
+
     def test_create_archive_disabled(self):
         """Test that archive is not created when disabled."""
         manager = OutputManager(create_zip_archive=False)
@@ -210,6 +263,15 @@ class TestOutputManager:
             non_existent = temp_path / "non_existent"
             assert manager.validate_output_permissions(non_existent) is False
 
+    def test_validate_output_permissions_probe(self):
+        """Test the probe-file check leaves no files behind."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            manager = OutputManager()
+
+            assert manager.validate_output_permissions(temp_path, probe=True) is True
+            assert list(temp_path.iterdir()) == []
+
     def test_cleanup_temporary_files(self):
         """Test temporary file cleanup."""
         with tempfile.TemporaryDirectory() as temp_dir: